@@ -0,0 +1,53 @@
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer
+
+MAX_STEP = 0.1
+
+
+class AnimationClock:
+    def __init__(self, tick, fps=60, history=600, parent=None):
+        self._tick = tick
+        self._last = None
+        self._timer = QTimer(parent)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+        self.frame_times = deque(maxlen=history)
+        self.fps = fps
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @fps.setter
+    def fps(self, fps):
+        self._fps = fps
+        self._timer.setInterval(max(1, round(1000 / fps)))
+
+    @property
+    def running(self):
+        return self._timer.isActive()
+
+    def start(self):
+        if not self.running:
+            self._last = perf_counter()
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _on_timeout(self):
+        now = perf_counter()
+        step, self._last = min(now - self._last, MAX_STEP), now
+        self._tick(step)
+
+    def record(self, seconds):
+        self.frame_times.append(seconds)
+
+    def stats(self):
+        if not self.frame_times:
+            return {'frames': 0, 'p50': None, 'p99': None}
+        p50, p99 = np.percentile(self.frame_times, [50, 99]) * 1000
+        return {'frames': len(self.frame_times), 'p50': float(p50), 'p99': float(p99)}
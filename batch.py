@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from geom import Clipper, Polygon
+
+OPERATIONS = ('difference', 'union', 'intersection', 'symmetric_difference')
+_worker_clip = None
+
+
+def _bbox(vertices):
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+def _overlaps(first, second):
+    return (first[0] <= second[1]).all() and (second[0] <= first[1]).all()
+
+
+def _outer(polygon):
+    return Polygon(polygon.vertices[::-1].copy()) if polygon.signed_area() < 0 else polygon
+
+
+def _disjoint_result(subject, clip, op):
+    if op == 'difference':
+        return [_outer(subject)]
+    if op == 'intersection':
+        return []
+    return [_outer(subject), _outer(clip)]
+
+
+def _clip_vertices(subject, clip, op):
+    result = getattr(Clipper(Polygon(subject), clip), op)()
+    return [polygon.vertices for polygon in result]
+
+
+def _init_worker(clip_vertices):
+    global _worker_clip
+    _worker_clip = Polygon(clip_vertices)
+
+
+def _clip_chunk(op, chunk):
+    return [(i, _clip_vertices(vertices, _worker_clip, op)) for i, vertices in chunk]
+
+
+def clip_many(subjects, clip, op='difference', workers=None, chunk_size=16):
+    if op not in OPERATIONS:
+        raise ValueError(op)
+    clip = clip if isinstance(clip, Polygon) else Polygon(np.asarray(clip, dtype=float))
+    clip_box = _bbox(clip.vertices)
+    pending = []
+    for i, subject in enumerate(subjects):
+        vertices = subject.vertices if isinstance(subject, Polygon) else np.asarray(subject, dtype=float)
+        if _overlaps(_bbox(vertices), clip_box):
+            pending.append((i, vertices))
+        else:
+            yield i, _disjoint_result(Polygon(vertices), clip, op)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for i, vertices in pending:
+            yield i, getattr(Clipper(Polygon(vertices), clip), op)()
+        return
+    chunks = [pending[k:k + chunk_size] for k in range(0, len(pending), chunk_size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(clip.vertices,)) as executor:
+        futures = [executor.submit(_clip_chunk, op, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for i, result in future.result():
+                yield i, [Polygon(vertices) for vertices in result]
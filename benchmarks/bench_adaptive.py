@@ -0,0 +1,61 @@
+from time import perf_counter
+
+import numpy as np
+
+import curves
+from benchmarks.workloads import sample
+from project import first_func
+
+SIZE = 800
+LEFT, RIGHT = -5, 5
+BOUNDS = (0, 0, SIZE, SIZE)
+PARAMS = (1, 1, 1)
+
+
+def curve(x):
+    scale = SIZE / (RIGHT - LEFT)
+    return np.column_stack([(x - LEFT) * scale, SIZE - (first_func(x, *PARAMS) - LEFT) * scale])
+
+
+def uniform_sample(count):
+    t, y = sample(first_func, PARAMS, LEFT, RIGHT, count)
+    points = curve(t)
+    finite = np.isfinite(points).all(axis=1)
+    with np.errstate(invalid='ignore'):
+        joined = finite[:-1] & finite[1:] & (np.abs(np.diff(points[:, 1])) < SIZE * 2)
+    return t, points, joined
+
+
+def max_error(t, points, joined, probes=16):
+    on_screen = ((points >= 0) & (points <= SIZE)).all(axis=1)
+    index = np.flatnonzero(joined & (on_screen[:-1] | on_screen[1:]))
+    fractions = np.linspace(0, 1, probes + 2)[1:-1]
+    with np.errstate(all='ignore'):
+        probe_t = t[index, None] + (t[index + 1] - t[index])[:, None] * fractions
+        exact = curve(probe_t.ravel()).reshape(len(index), probes, 2)
+        chord = points[index, None] + (points[index + 1] - points[index])[:, None] * fractions[:, None]
+        exact = np.clip(exact, -SIZE, 2 * SIZE)
+        chord = np.clip(chord, -SIZE, 2 * SIZE)
+        error = np.hypot(*(exact - chord).transpose(2, 0, 1))
+    return np.nanmax(error)
+
+
+def report(name, sampler):
+    start = perf_counter()
+    t, points, joined = sampler()
+    elapsed = perf_counter() - start
+    print("{:>22} {:>8} {:>12.2f} {:>10.4f}".format(name, len(t), max_error(t, points, joined), elapsed))
+
+
+def main():
+    print("{:>22} {:>8} {:>12} {:>10}".format("sampler", "samples", "max err, px", "time, s"))
+    for count in (500, 2000, 5000, 20000, 200000):
+        report("uniform", lambda: uniform_sample(count))
+    for tolerance in (1, 0.25, 0.05):
+        report("adaptive tol={}".format(tolerance),
+               lambda: curves.adaptive_sample(curve, LEFT, RIGHT, 100000, tolerance=tolerance, bounds=BOUNDS))
+    report("adaptive reversed", lambda: curves.adaptive_sample(curve, RIGHT, LEFT, 100000, bounds=BOUNDS))
+
+
+if __name__ == '__main__':
+    main()
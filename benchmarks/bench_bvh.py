@@ -0,0 +1,63 @@
+from math import pi
+from time import perf_counter
+
+import numpy as np
+
+import geom
+from benchmarks.workloads import blob_vertices, star_vertices
+from geom import Point2D, Polygon, Segment
+
+
+def workload(polygon, rng):
+    vertices = polygon.vertices
+    edges = rng.integers(0, len(vertices), 500)
+    on_edges = vertices[edges] + (np.roll(vertices, -1, axis=0)[edges] - vertices[edges]) * 0.5
+    starts = rng.uniform(-11, 11, (200, 2))
+    angles = rng.uniform(0, 2 * pi, 200)
+    ends = starts + np.column_stack([np.cos(angles), np.sin(angles)])
+    return (
+        [Point2D(p) for p in on_edges.tolist()],
+        [Segment(*p, *q) for p, q in zip(starts.tolist(), ends.tolist())],
+        rng.uniform(-11, 11, (5000, 2)),
+    )
+
+
+def run(polygon, points, segments, queries):
+    timings = []
+    start = perf_counter()
+    found = [polygon.find_segment_by_point(p) for p in points]
+    timings.append(perf_counter() - start)
+    start = perf_counter()
+    crossed = [len(polygon.intersects_with(s)) for s in segments]
+    timings.append(perf_counter() - start)
+    start = perf_counter()
+    located = polygon.locate_many(queries)
+    timings.append(perf_counter() - start)
+    return timings, (found, crossed, located.tolist())
+
+
+def main():
+    print("{:>6} {:>8} {:>9} {:>22} {:>22} {:>22}".format(
+        "shape", "vertices", "build, ms", "find segment, us/q", "intersects_with, us/q", "locate_many, us/q"))
+    threshold = geom.TREE_EDGES
+    for name, shape, n in ([('blob', blob_vertices, n) for n in (16, 64, 256, 1024, 4096, 16384, 65536)]
+                           + [('star', star_vertices, 1024), ('star', star_vertices, 16384)]):
+        polygon = Polygon(shape(n))
+        points, segments, queries = workload(polygon, np.random.default_rng(n))
+        polygon.segments
+        geom.TREE_EDGES = float('inf')
+        linear, expected = run(polygon, points, segments, queries)
+        geom.TREE_EDGES = 0
+        start = perf_counter()
+        polygon.edge_tree
+        build = perf_counter() - start
+        tree, result = run(polygon, points, segments, queries)
+        geom.TREE_EDGES = threshold
+        assert result == expected
+        cells = ["{:>9.1f} -> {:>8.1f}".format(old / count * 1e6, new / count * 1e6)
+                 for old, new, count in zip(linear, tree, (len(points), len(segments), len(queries)))]
+        print("{:>6} {:>8} {:>9.2f} {:>22} {:>22} {:>22}".format(name, n, build * 1e3, *cells))
+
+
+if __name__ == '__main__':
+    main()
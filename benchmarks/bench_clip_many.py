@@ -0,0 +1,45 @@
+import os
+from math import cos, pi, sin
+from random import Random
+from time import perf_counter
+
+import numpy as np
+
+from batch import clip_many
+from geom import Polygon
+
+
+def random_star(rng, n, cx, cy):
+    return np.array([
+        (cx + rng.uniform(1, 3) * cos(2 * pi * i / n), cy + rng.uniform(1, 3) * sin(2 * pi * i / n))
+        for i in range(n)
+    ])
+
+
+def workload(count, seed=0):
+    rng = Random(seed)
+    side = int(count ** 0.5) + 1
+    subjects = [Polygon(random_star(rng, rng.randint(50, 200), 4 * (i % side), 4 * (i // side))) for i in range(count)]
+    clip = Polygon(random_star(rng, 400, 0, 0) * [side, side / 2] + 2 * side)
+    return subjects, clip
+
+
+def main():
+    subjects, clip = workload(400)
+    start = perf_counter()
+    expected = [sum(p.signed_area() for p in subject - clip) for subject in subjects]
+    serial = perf_counter() - start
+    print("{:>10} {:>10} {:>8}".format("workers", "time, s", "speedup"))
+    print("{:>10} {:>10.3f} {:>8}".format("loop", serial, "1.0x"))
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = perf_counter()
+        areas = [0.0] * len(subjects)
+        for i, result in clip_many(subjects, clip, workers=workers):
+            areas[i] = sum(p.signed_area() for p in result)
+        elapsed = perf_counter() - start
+        assert np.allclose(areas, expected)
+        print("{:>10} {:>10.3f} {:>7.1f}x".format(workers, elapsed, serial / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+from random import Random
+from time import perf_counter
+
+from benchmarks.workloads import regular_star
+from geom import Point2D, Segment
+
+
+def per_point_contains(polygon, item):
+    for seg in polygon.segments:
+        if item in seg:
+            return True
+    inf = Point2D(1234567890, 999999999)
+    return len(list(filter(lambda x: x.intersects(Segment(item, inf)) is not None, polygon.segments))) % 2 == 1
+
+
+def main():
+    print("{:>8} {:>8} {:>14} {:>14} {:>16} {:>8}".format(
+        "vertices", "points", "per-point, s", "__contains__, s", "contains_many, s", "speedup"))
+    for n, count in ((16, 2000), (200, 2000), (2000, 1000), (10000, 200)):
+        polygon = regular_star(n)
+        rng = Random(n)
+        points = [Point2D(rng.uniform(-11, 11), rng.uniform(-11, 11)) for _ in range(count)]
+        start = perf_counter()
+        expected = [per_point_contains(polygon, p) for p in points]
+        per_point = perf_counter() - start
+        start = perf_counter()
+        single = [p in polygon for p in points]
+        contains = perf_counter() - start
+        start = perf_counter()
+        batch = polygon.contains_many([p.coords for p in points])
+        many = perf_counter() - start
+        assert expected == single == batch.tolist()
+        print("{:>8} {:>8} {:>14.3f} {:>15.3f} {:>16.4f} {:>7.0f}x".format(
+            n, count, per_point, contains, many, per_point / many))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import os
+from time import perf_counter
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter
+
+from benchmarks.workloads import continuous_runs, sample
+from project import first_func, to_qpolygon
+
+SIZE = 800
+LEFT, RIGHT = -5, 5
+PARAMS = (1, 1, 1)
+
+
+def to_screen(x, y):
+    scale = SIZE / (RIGHT - LEFT)
+    return np.column_stack([(x - LEFT) * scale, SIZE - (y - LEFT) * scale])
+
+
+def per_sample_lines(qp, steps):
+    scale = SIZE / (RIGHT - LEFT)
+    step = (RIGHT - LEFT) / (steps - 1)
+
+    def point(x):
+        try:
+            y = first_func(x, *PARAMS)
+        except ZeroDivisionError:
+            y = 999999
+        return QPointF((x - LEFT) * scale, SIZE - (y - LEFT) * scale)
+
+    prev = point(LEFT)
+    for i in range(1, steps):
+        current = point(LEFT + i * step)
+        if abs(current.y() - prev.y()) < SIZE * 2:
+            qp.drawLine(prev, current)
+        prev = current
+
+
+def vectorized_polylines(qp, steps):
+    x, y = sample(first_func, PARAMS, LEFT, RIGHT, steps)
+    for run in continuous_runs(to_screen(x, y), SIZE * 2):
+        qp.drawPolyline(to_qpolygon(run))
+
+
+def timed(draw, steps):
+    image = QImage(SIZE, SIZE, QImage.Format_RGB32)
+    qp = QPainter(image)
+    start = perf_counter()
+    draw(qp, steps)
+    elapsed = perf_counter() - start
+    qp.end()
+    return elapsed
+
+
+def main():
+    app = QGuiApplication([])
+    print("{:>8} {:>12} {:>15} {:>8}".format("steps", "per-line, s", "polylines, s", "speedup"))
+    for steps in (500, 5000, 50000, 200000):
+        loop = timed(per_sample_lines, steps)
+        vectorized = timed(vectorized_polylines, steps)
+        print("{:>8} {:>12.4f} {:>15.4f} {:>7.0f}x".format(steps, loop, vectorized, loop / vectorized))
+    del app
+
+
+if __name__ == '__main__':
+    main()
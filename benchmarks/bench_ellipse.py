@@ -0,0 +1,72 @@
+import os
+from time import perf_counter
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter
+
+from project import ELLIPSE_PIXEL, ellipse_rects
+from raster import midpoint_ellipse
+
+SIZE = 800
+
+
+def greedy_walk(qp, a, b, r, pixel_size=ELLIPSE_PIXEL):
+    x0 = y0 = SIZE // 2
+    x, y = int(x0 - r), y0
+    while x < x0:
+        for px, py in ((x, y), (2 * x0 - x, 2 * y0 - y), (x, 2 * y0 - y), (2 * x0 - x, y)):
+            qp.drawRect(px - pixel_size // 2, py - pixel_size // 2, pixel_size, pixel_size)
+        min_point, min_len = (0, 0), 9999999
+        for dx, dy in ((0, -1), (1, 0), (1, -1)):
+            new_x, new_y = x + dx * pixel_size, y + dy * pixel_size
+            ln = abs((new_x - x0) ** 2 * a + (new_y - y0) ** 2 * b - r ** 2)
+            if ln < min_len:
+                min_len, min_point = ln, (new_x, new_y)
+        x, y = map(int, min_point)
+        for px, py in ((x, y), (2 * x0 - x, 2 * y0 - y), (x, 2 * y0 - y), (2 * x0 - x, y)):
+            qp.drawRect(px - pixel_size // 2, py - pixel_size // 2, pixel_size, pixel_size)
+
+
+def midpoint(qp, a, b, r):
+    qp.save()
+    qp.translate(SIZE // 2, SIZE // 2)
+    qp.drawRects(ellipse_rects(a, b, r, 1, ELLIPSE_PIXEL))
+    qp.restore()
+
+
+def check_extremes(limit=60):
+    for rx in range(1, limit):
+        for ry in range(1, limit):
+            cells = set(map(tuple, midpoint_ellipse(rx, ry).tolist()))
+            assert {(rx, 0), (-rx, 0), (0, ry), (0, -ry)} <= cells, (rx, ry)
+
+
+def timed(draw, *args):
+    image = QImage(SIZE, SIZE, QImage.Format_RGB32)
+    qp = QPainter(image)
+    start = perf_counter()
+    draw(qp, *args)
+    elapsed = perf_counter() - start
+    qp.end()
+    return elapsed
+
+
+def main():
+    check_extremes()
+    app = QGuiApplication([])
+    print("{:>8} {:>7} {:>12} {:>14} {:>12} {:>8}".format(
+        "radius", "a:b", "greedy, s", "midpoint, s", "cached, s", "speedup"))
+    for radius in (300, 3000, 30000, 100000):
+        for a, b in ((1, 1), (1, 4)):
+            ellipse_rects.cache_clear()
+            greedy = timed(greedy_walk, a, b, radius)
+            cold = timed(midpoint, a, b, radius)
+            warm = timed(midpoint, a, b, radius)
+            print("{:>8} {:>7} {:>12.4f} {:>14.4f} {:>12.4f} {:>7.0f}x".format(
+                radius, "{}:{}".format(a, b), greedy, cold, warm, greedy / warm))
+    del app
+
+
+if __name__ == '__main__':
+    main()
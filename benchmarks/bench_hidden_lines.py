@@ -0,0 +1,62 @@
+import numpy as np
+
+from benchmarks.workloads import timed
+from geom import Solid
+from hidden_lines import PAIRS_CHUNK, SolidSet, hidden_intervals, visible_pieces, visible_segments
+from project import ISO_PROJECTION
+
+VIEW_POINT = np.array([1, 1, 1, 0])
+
+
+def random_scene(count, facets=10, seed=0):
+    rng = np.random.default_rng(seed)
+    normals = rng.normal(size=(facets, 3))
+    normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    base = Solid(np.vstack([-normals.T, np.ones(facets)]))
+    spread = 1.5 * count ** 0.5
+    solids = []
+    for _ in range(count):
+        transform = np.eye(4)
+        transform[:3, :3] = np.linalg.qr(rng.normal(size=(3, 3)))[0] * rng.uniform(0.5, 1.5)
+        transform[:3, 3] = rng.uniform(-spread, spread, 3)
+        solids.append(base.transformed(transform))
+    return solids
+
+
+def all_pairs(solids, view_point, projection):
+    view_point = np.asarray(view_point, dtype=float)
+    scene = SolidSet(solids)
+    back = view_point.dot(scene.matrix) > 0
+    shown = ~(back[scene.edge_facets[:, 0]] & back[scene.edge_facets[:, 1]])
+    segments = scene.vertices[scene.edge_vertices[shown]]
+    edges, occluders = np.divmod(np.arange(len(segments) * len(solids)), len(solids))
+    keep = scene.edge_owner[shown][edges] != occluders
+    edges, occluders = edges[keep], occluders[keep]
+    planes = scene.shadow_planes(view_point, back)
+    hidden = []
+    for chunk in range(0, len(edges), PAIRS_CHUNK):
+        part = edges[chunk:chunk + PAIRS_CHUNK]
+        first, second = segments[part].transpose(1, 0, 2)
+        mask, lo, hi = hidden_intervals(first, second, planes[occluders[chunk:chunk + PAIRS_CHUNK]])
+        hidden.append((part[mask], lo[mask], hi[mask]))
+    return visible_pieces(len(segments), *(np.concatenate(column) for column in zip(*hidden)))
+
+
+def main():
+    print("{:>7} {:>7} {:>10} {:>14} {:>12} {:>8}".format(
+        "solids", "edges", "segments", "all pairs, ms", "grid, ms", "speedup"))
+    for count in (10, 50, 100, 300, 1000):
+        solids = random_scene(count)
+        edges = sum(len(solid.edge_vertices) for solid in solids)
+        grid, segments = timed(visible_segments, solids, VIEW_POINT, ISO_PROJECTION)
+        if count <= 300:
+            brute, pieces = timed(all_pairs, solids, VIEW_POINT, ISO_PROJECTION)
+            assert len(pieces) == len(segments)
+            print("{:>7} {:>7} {:>10} {:>14.1f} {:>12.1f} {:>7.1f}x".format(
+                count, edges, len(segments), brute * 1e3, grid * 1e3, brute / grid))
+        else:
+            print("{:>7} {:>7} {:>10} {:>14} {:>12.1f} {:>8}".format(count, edges, len(segments), "-", grid * 1e3, "-"))
+
+
+if __name__ == '__main__':
+    main()
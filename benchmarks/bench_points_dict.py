@@ -0,0 +1,35 @@
+from random import Random
+from time import perf_counter
+
+from benchmarks.workloads import regular_star
+from geom import EPS, Point2D, PointsDict
+
+
+class LinearPointsDict(dict):
+    def __getitem__(self, item):
+        for k, v in self.items():
+            if abs(k.x - item.x) < EPS and abs(k.y - item.y) < EPS:
+                return v
+
+
+def time_lookups(n, points_dict, lookups=1000):
+    points = regular_star(n).points
+    index = points_dict([(points[i], i) for i in range(len(points))])
+    queries = Random(n).sample(points, lookups)
+    start = perf_counter()
+    for point in queries:
+        index[Point2D(point.x + EPS / 3, point.y - EPS / 3)]
+    return (perf_counter() - start) / lookups
+
+
+def main():
+    print("get_index_by_point lookup")
+    print("{:>8} {:>12} {:>12} {:>8}".format("vertices", "linear, us", "grid, us", "speedup"))
+    for n in (2000, 10000, 20000):
+        linear = time_lookups(n, LinearPointsDict) * 1e6
+        grid = time_lookups(n, PointsDict) * 1e6
+        print("{:>8} {:>12.2f} {:>12.2f} {:>7.1f}x".format(n, linear, grid, linear / grid))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import gc
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from geom import Point2D, Polygon
+
+
+def circle_vertices(n):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.stack([10 * np.cos(angles), 10 * np.sin(angles)], axis=1)
+
+
+def build_objects(vertices):
+    polygon = Polygon([Point2D(x, y) for x, y in vertices.tolist()])
+    polygon.segments, polygon.get_index_by_point, polygon.get_index_by_segment
+    return polygon
+
+
+def build_compact(vertices):
+    return Polygon(vertices)
+
+
+def measure(build, vertices):
+    gc.collect()
+    start = perf_counter()
+    polygon = build(vertices)
+    elapsed = perf_counter() - start
+    del polygon
+    gc.collect()
+    tracemalloc.start()
+    polygon = build(vertices)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del polygon
+    return elapsed, retained, peak
+
+
+def main():
+    print("{:>8} {:>9} {:>10} {:>14} {:>12}".format("vertices", "mode", "build, s", "retained, B/v", "peak, B/v"))
+    for n in (10000, 100000, 300000):
+        vertices = circle_vertices(n)
+        for name, build in (("objects", build_objects), ("compact", build_compact)):
+            elapsed, retained, peak = measure(build, vertices)
+            print("{:>8} {:>9} {:>10.3f} {:>14.0f} {:>12.0f}".format(n, name, elapsed, retained / n, peak / n))
+
+
+if __name__ == '__main__':
+    main()
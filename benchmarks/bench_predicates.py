@@ -0,0 +1,120 @@
+from fractions import Fraction
+
+import numpy as np
+
+from benchmarks.workloads import timed
+from geom import BOUNDARY, EPS, INSIDE, OUTSIDE, Polygon
+from predicates import ORIENT_BOUND, orient2d, orient2d_many
+
+RAY_END = 1234567890, 999999999
+
+
+def _on_segments(x, y, a, b, c, x_min, x_max, y_min, y_max):
+    return ((abs(a * x + b * y + c) <= EPS)
+            & (x_min - EPS <= x) & (x <= x_max + EPS) & (y_min - EPS <= y) & (y <= y_max + EPS))
+
+
+def eps_locate(vertices, points):
+    first, second = vertices, np.roll(vertices, -1, axis=0)
+    a, b = first[:, 1] - second[:, 1], second[:, 0] - first[:, 0]
+    c = first[:, 0] * second[:, 1] - second[:, 0] * first[:, 1]
+    norm = np.where(abs(a) > EPS, a, b)
+    a, b, c = a / norm, b / norm, c / norm
+    edges = (a, b, c, np.minimum(first[:, 0], second[:, 0]), np.maximum(first[:, 0], second[:, 0]),
+             np.minimum(first[:, 1], second[:, 1]), np.maximum(first[:, 1], second[:, 1]))
+    px, py = points[:, :, np.newaxis].transpose(1, 0, 2)
+    on_boundary = _on_segments(px, py, *edges).any(axis=1)
+    ka, kb, kc = py - RAY_END[1], RAY_END[0] - px, px * RAY_END[1] - RAY_END[0] * py
+    ra, rb, rc = 1, kb / ka, kc / ka
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = (ra * c - rc) / (rb - ra * b)
+        x = np.where(a == 1, -b * y - c, (rb * c - rc) / (ra - a * rb))
+        y = np.where(a == 1, y, -a * x - c)
+    ray_box = np.minimum(px, RAY_END[0]), np.maximum(px, RAY_END[0]), np.minimum(py, RAY_END[1]), np.maximum(py, RAY_END[1])
+    crossings = (abs(a * rb - ra * b) >= EPS) & _on_segments(x, y, *edges) & _on_segments(x, y, ra, rb, rc, *ray_box)
+    inside = np.where(np.count_nonzero(crossings, axis=1) % 2 == 1, INSIDE, OUTSIDE)
+    return np.where(on_boundary, BOUNDARY, inside)
+
+
+def exact_locate(vertices, point):
+    px, py = map(Fraction, point)
+    crossings = 0
+    for (x0, y0), (x1, y1) in zip(vertices.tolist(), np.roll(vertices, -1, axis=0).tolist()):
+        x0, y0, x1, y1 = map(Fraction, (x0, y0, x1, y1))
+        side = (x0 - px) * (y1 - py) - (y0 - py) * (x1 - px)
+        if side == 0 and min(x0, x1) <= px <= max(x0, x1) and min(y0, y1) <= py <= max(y0, y1):
+            return BOUNDARY
+        if (y0 <= py < y1 and side > 0) or (y1 <= py < y0 and side < 0):
+            crossings += 1
+    return INSIDE if crossings % 2 else OUTSIDE
+
+
+def star(n, rng, scale):
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radii = rng.integers(20, 60, n)
+    vertices = np.round(np.column_stack([radii * np.cos(angles), radii * np.sin(angles)]))
+    return vertices[(vertices != np.roll(vertices, 1, axis=0)).any(axis=1)] * scale
+
+
+def queries(vertices, count, rng, kind):
+    scale = abs(vertices).max()
+    if kind == 'random':
+        return rng.uniform(-scale, scale, (count, 2))
+    edges = rng.integers(0, len(vertices), count)
+    first, second = vertices[edges], np.roll(vertices, -1, axis=0)[edges]
+    points = first + (second - first) * rng.integers(0, 5, (count, 1)) / 4
+    if kind == 'near':
+        points += rng.choice([-1, 1], (count, 2)) * scale * 1e-9
+    return points
+
+
+def orient_table(rng):
+    print("{:>10} {:>10} {:>12} {:>10}".format("inputs", "tests", "ns / test", "fallback, %"))
+    for kind in ('random', 'collinear'):
+        a, b = rng.uniform(-1e3, 1e3, (2, 1000000, 2))
+        c = rng.uniform(-1e3, 1e3, (1000000, 2)) if kind == 'random' else a + (b - a) * rng.integers(0, 9, (1000000, 1)) / 8
+        elapsed, signs = timed(orient2d_many, *a.T, *b.T, *c.T)
+        left = (a[:, 0] - c[:, 0]) * (b[:, 1] - c[:, 1])
+        right = (a[:, 1] - c[:, 1]) * (b[:, 0] - c[:, 0])
+        exact = np.abs(left - right) < ORIENT_BOUND * (np.abs(left) + np.abs(right))
+        print("{:>10} {:>10} {:>12.1f} {:>10.3f}".format(kind, len(a), elapsed / len(a) * 1e9, exact.mean() * 100))
+
+
+def scalar_table(rng):
+    print("{:>10} {:>10} {:>10}".format("scalars", "tests", "wrong"))
+    a, b = rng.uniform(-1e3, 1e3, (2, 2000, 2))
+    c = a + (b - a) * rng.integers(0, 9, (2000, 1)) / 8
+    c[::2] = rng.uniform(-1e3, 1e3, (1000, 2))
+    expected = orient2d_many(*a.T, *b.T, *c.T)
+    for kind, convert in (('float', float), ('numpy', np.float64)):
+        signs = np.array([orient2d(*(tuple(map(convert, p)) for p in points)) for points in zip(a, b, c)])
+        print("{:>10} {:>10} {:>10}".format(kind, len(signs), np.count_nonzero(signs != expected)))
+
+
+def locate_table(rng):
+    print("{:>8} {:>8} {:>8} {:>12} {:>12} {:>10} {:>10}".format(
+        "scale", "queries", "points", "EPS, ms", "filtered, ms", "EPS wrong", "wrong"))
+    for scale in (1e-4, 1, 1e6):
+        vertices = star(200, rng, scale)
+        polygon = Polygon(vertices)
+        for kind in ('random', 'on edges', 'near'):
+            points = queries(vertices, 2000, rng, kind)
+            expected = np.array([exact_locate(vertices, p) for p in points.tolist()])
+            old, old_result = timed(eps_locate, vertices, points)
+            new, new_result = timed(polygon.locate_many, points)
+            print("{:>8g} {:>8} {:>8} {:>12.2f} {:>12.2f} {:>10} {:>10}".format(
+                scale, kind, len(points), old * 1e3, new * 1e3,
+                np.count_nonzero(old_result != expected), np.count_nonzero(new_result != expected)))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    orient_table(rng)
+    print()
+    scalar_table(rng)
+    print()
+    locate_table(rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from collections import defaultdict
+from time import perf_counter
+
+import numpy as np
+from numpy.linalg import matrix_rank, solve
+
+from benchmarks.workloads import random_polytope
+from geom import EPS, Point3D, Solid
+
+
+def triple_loop_solid(matrix):
+    points = []
+    point_to_facets = defaultdict(set)
+    s = matrix.shape[1]
+    for i in range(s):
+        for j in range(i, s):
+            for k in range(j, s):
+                point_m = np.array([matrix[:, i], matrix[:, j], matrix[:, k]])
+                base_m = point_m[:, 0:3]
+                free_c = -point_m[:, 3]
+                if matrix_rank(base_m) == 3:
+                    point = Point3D(solve(base_m, free_c))
+                    if all(x >= -EPS for x in np.array(point.coords + (1,)).dot(matrix)):
+                        points.append(point)
+                        point_to_facets[point] = point_to_facets[point].union(set(map(tuple, point_m)))
+    edges = {}
+    for i in range(len(points)):
+        for j in range(i + 1, len(points)):
+            common = point_to_facets[points[i]].intersection(point_to_facets[points[j]])
+            if len(common) >= 2:
+                edges[tuple(sorted(common))] = points[i], points[j]
+    return points, edges
+
+
+def main():
+    print("{:>7} {:>9} {:>14} {:>12} {:>8}".format("facets", "vertices", "triple loop, s", "Solid, s", "speedup"))
+    for s in (10, 20, 40, 80, 160, 320):
+        matrix = random_polytope(s)
+        start = perf_counter()
+        solid = Solid(matrix)
+        elapsed = perf_counter() - start
+        if s <= 80:
+            start = perf_counter()
+            points, _ = triple_loop_solid(matrix)
+            loop = perf_counter() - start
+            assert [p.coords for p in points] == [p.coords for p in solid.points]
+            print("{:>7} {:>9} {:>14.3f} {:>12.3f} {:>7.0f}x".format(s, len(solid.points), loop, elapsed, loop / elapsed))
+        else:
+            print("{:>7} {:>9} {:>14} {:>12.3f} {:>8}".format(s, len(solid.points), "-", elapsed, "-"))
+
+
+if __name__ == '__main__':
+    main()
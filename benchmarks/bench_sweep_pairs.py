@@ -0,0 +1,39 @@
+from math import cos, pi, sin
+from time import perf_counter
+
+from geom import Point2D, Polygon, sweep_pairs
+
+
+def all_pairs(first, second):
+    return ((i, j) for i in range(len(first)) for j in range(len(second)))
+
+
+def wavy_polygon(n, phase, waves=25):
+    return Polygon([
+        Point2D((10 + 2 * sin(waves * 2 * pi * i / n + phase)) * cos(2 * pi * i / n),
+                (10 + 2 * sin(waves * 2 * pi * i / n + phase)) * sin(2 * pi * i / n))
+        for i in range(n)
+    ])
+
+
+def time_crossings(n, pairs):
+    first, second = wavy_polygon(n, 0).segments, wavy_polygon(n, pi / 2).segments
+    start = perf_counter()
+    crossings = sum(first[i].intersects(second[j]) is not None for i, j in pairs(first, second))
+    return perf_counter() - start, crossings
+
+
+def main():
+    print("{:>8} {:>10} {:>14} {:>12} {:>8}".format("vertices", "crossings", "all pairs, s", "sweep, s", "speedup"))
+    for n in (250, 500, 1000, 4000):
+        sweep, crossings = time_crossings(n, sweep_pairs)
+        if n <= 1000:
+            brute, expected = time_crossings(n, all_pairs)
+            assert crossings == expected
+            print("{:>8} {:>10} {:>14.3f} {:>12.3f} {:>7.1f}x".format(n, crossings, brute, sweep, brute / sweep))
+        else:
+            print("{:>8} {:>10} {:>14} {:>12.3f} {:>8}".format(n, crossings, "-", sweep, "-"))
+
+
+if __name__ == '__main__':
+    main()
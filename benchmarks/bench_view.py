@@ -0,0 +1,47 @@
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from PyQt5.QtCore import QPointF
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.workloads import timed
+from project import Example
+
+
+def get_real_coord(example, t_coords):
+    relative_t_coords = t_coords - example.t_left_top
+    relative_real_coords = QPointF(relative_t_coords.x() * example.get_x_scale(),
+                                   example.real_height() - relative_t_coords.y() * example.get_y_scale())
+    return relative_real_coords + example.leftTop()
+
+
+def per_point(example, points):
+    return [get_real_coord(example, QPointF(x, y)) for x, y in points.tolist()]
+
+
+def batched(example, points):
+    return example.view_transform().apply(points)
+
+
+def main():
+    app = QApplication([])
+    example = Example()
+    rng = np.random.default_rng(0)
+    print("{:>8} {:>18} {:>18} {:>8}".format("points", "get_real_coord, ns", "ViewTransform, ns", "speedup"))
+    for count in (1, 100, 10000, 100000, 1000000):
+        points = rng.uniform(-5, 5, (count, 2))
+        new = timed(batched, example, points)[0] / count * 1e9
+        if count <= 100000:
+            old = timed(per_point, example, points)[0] / count * 1e9
+            expected = np.array([(p.x(), p.y()) for p in per_point(example, points)])
+            assert np.allclose(expected, batched(example, points))
+            print("{:>8} {:>18.0f} {:>18.1f} {:>7.0f}x".format(count, old, new, old / new))
+        else:
+            print("{:>8} {:>18} {:>18.1f} {:>8}".format(count, "-", new, "-"))
+    del app
+
+
+if __name__ == '__main__':
+    main()
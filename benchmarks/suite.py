@@ -0,0 +1,150 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+import curves
+import hidden_lines
+from benchmarks import workloads
+from geom import Polygon, Solid
+from project import ISO_PROJECTION
+from view import ViewTransform
+
+THRESHOLD = 0.2
+MIN_TIME = 0.5
+SCREEN = 200, 0, 1000, 800
+VIEW = ViewTransform.from_windows((-5, -5, 5, 5), SCREEN)
+_app = None
+
+
+def polygon_cases():
+    for kind in ('simple', 'star'):
+        for n in (16, 128, 512):
+            first, second = workloads.polygon_pair(n, kind)
+            yield 'polygon.sub.{}.{}'.format(kind, n), lambda a=first.vertices, b=second.vertices: Polygon(a) - Polygon(b)
+
+
+def solid_cases():
+    for s in (10, 40, 160):
+        yield 'solid.init.{}'.format(s), lambda matrix=workloads.random_polytope(s): Solid(matrix)
+
+
+def grid_cases():
+    def adaptive(world, start, stop, tolerance=0.25):
+        return curves.adaptive_sample(
+            lambda t: VIEW.apply(curves.evaluate(world, t)), start, stop, 100000, tolerance=tolerance, bounds=SCREEN)
+
+    for tolerance in (0.25, 0.05):
+        yield 'curve.adaptive.{}'.format(tolerance), lambda tolerance=tolerance: [
+            adaptive(*curve, tolerance=tolerance) for curve in workloads.curve_set()]
+    cache, window = curves.SampleCache(), (-5, -5, 5, 5)
+    yield 'curve.cache.pan', lambda: [
+        cache.get(key, (start + shift, stop - shift), window, VIEW.scale, lambda: (window, *adaptive(world, start, stop)))
+        for key, (world, start, stop) in enumerate(workloads.curve_set()) for shift in np.linspace(0, 0.5, 10)]
+    for rows, columns in ((47, 199), (470, 1990)):
+        yield 'surface.grid.{}x{}'.format(rows, columns), lambda rows=rows, columns=columns: VIEW.apply(
+            workloads.surface_grid(rows, columns), [[1, 0], [0, 1], [-0.5, -0.5]])
+    solids = [workloads.random_solid(12, seed) for seed in range(20)]
+    yield 'solid.hidden_lines.20', lambda: hidden_lines.visible_segments(solids, np.array([1, 1, 1, 0]), ISO_PROJECTION)
+
+
+def render_cases(size=(800, 600)):
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from project import Example
+    _app = QApplication.instance() or QApplication([])
+    example = Example()
+    example.c = 2
+    for task in range(1, len(example.TASKS) + 1):
+        def render(task=task):
+            example.task_number = task
+            return example.render_image(*size)
+        yield 'render.{}'.format(example.TASKS[task - 1]), render
+
+
+CASES = polygon_cases, solid_cases, grid_cases, render_cases
+
+
+def measure(func, repeat):
+    timings = []
+    while len(timings) < repeat or sum(timings) < MIN_TIME:
+        gc.collect()
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': min(timings), 'median': float(np.median(timings)), 'peak_kb': peak / 1024}
+
+
+def run(patterns=(), repeat=5):
+    results = {}
+    for cases in CASES:
+        for name, func in cases():
+            if not patterns or any(pattern in name for pattern in patterns):
+                results[name] = measure(func, repeat)
+                print("{:<36} {:>10.3f} ms {:>10.3f} ms {:>10.0f} KiB".format(
+                    name, results[name]['seconds'] * 1e3, results[name]['median'] * 1e3, results[name]['peak_kb']))
+    return results
+
+
+def save(path, results):
+    with open(path, 'w') as file:
+        json.dump({
+            'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'cases': results,
+        }, file, indent=1, sort_keys=True)
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    regressions = []
+    print("{:<36} {:>9} {:>9}".format("case", "time", "peak"))
+    for name, result in results.items():
+        old = baseline['cases'].get(name)
+        if old is None:
+            continue
+        ratios = [result[key] / old[key] if old[key] else 1.0 for key in ('seconds', 'median', 'peak_kb')]
+        ratios = [min(ratios[:2]), ratios[2]]
+        flags = ['!' if ratio > 1 + threshold else ' ' for ratio in ratios]
+        print("{:<36} {:>7.2f}x{} {:>7.2f}x{}".format(name, ratios[0], flags[0], ratios[1], flags[1]))
+        if '!' in flags:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the benchmark suite and compare it with a JSON baseline.')
+    parser.add_argument('patterns', nargs='*', help='only run cases whose name contains one of these')
+    parser.add_argument('--repeat', type=int, default=5, help='minimum runs per case')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a baseline')
+    parser.add_argument('--compare', metavar='PATH', help='flag regressions against this baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='allowed slowdown, 0.2 is 20%%')
+    args = parser.parse_args(argv)
+
+    print("{:<36} {:>13} {:>13} {:>14}".format("case", "best", "median", "peak"))
+    results = run(args.patterns, args.repeat)
+    if args.save:
+        save(args.save, results)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("{} regression(s) beyond {:.0%}: {}".format(len(regressions), args.threshold, ', '.join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
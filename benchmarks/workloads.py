@@ -0,0 +1,95 @@
+from time import perf_counter
+
+import numpy as np
+
+import curves
+from geom import Point2D, Polygon, Solid
+from project import fifth_func, first_func, second_func
+
+TETRAHEDRON = np.array([[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]) / np.sqrt(3)
+
+
+def simple_polygon(n, seed=0, centre=(0, 0), radius=10):
+    rng = np.random.default_rng(seed)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radii = radius * rng.uniform(0.3, 1, n)
+    return Polygon(np.column_stack([radii * np.cos(angles), radii * np.sin(angles)]) + centre)
+
+
+def star_polygon(n, seed=0, centre=(0, 0), radius=10, depth=0.5):
+    rng = np.random.default_rng(seed)
+    angles = 2 * np.pi * (np.arange(n) + rng.uniform(-0.25, 0.25, n)) / n
+    radii = radius * np.where(np.arange(n) % 2, 1, depth) * rng.uniform(0.9, 1, n)
+    return Polygon(np.column_stack([radii * np.cos(angles), radii * np.sin(angles)]) + centre)
+
+
+def regular_star(n, r_outer=10, r_inner=7):
+    angles = 2 * np.pi * np.arange(n) / n
+    radii = np.where(np.arange(n) % 2, r_outer, r_inner)
+    return Polygon([Point2D(x, y) for x, y in zip((radii * np.cos(angles)).tolist(), (radii * np.sin(angles)).tolist())])
+
+
+def star_vertices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = 2 * np.pi * np.arange(n) / n
+    radii = np.where(np.arange(n) % 2, 10, 7) + rng.uniform(-0.5, 0.5, n)
+    return np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+
+
+def blob_vertices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = 2 * np.pi * np.arange(n) / n
+    radii = 8 + sum(rng.uniform(-0.4, 0.4) * np.sin(k * angles + rng.uniform(0, 2 * np.pi)) for k in range(1, 12))
+    return np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+
+
+def polygon_pair(n, kind='simple', seed=0):
+    make = simple_polygon if kind == 'simple' else star_polygon
+    return make(n, seed), make(n, seed + 1, centre=(4, 3))
+
+
+def random_polytope(s, seed=0):
+    rng = np.random.default_rng(seed)
+    rotation = np.linalg.qr(rng.normal(size=(3, 3)))[0]
+    normals = np.vstack([TETRAHEDRON.dot(rotation), rng.normal(size=(max(s - 4, 0), 3))])[:s]
+    normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    return np.vstack([-normals.T, rng.uniform(0.8, 1.2, s)])
+
+
+def random_solid(s, seed=0):
+    return Solid(random_polytope(s, seed))
+
+
+def sample(func, params, start, stop, count):
+    t = np.linspace(start, stop, count)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return t, np.broadcast_to(func(t, *params), t.shape).astype(float)
+
+
+def continuous_runs(points, max_jump=np.inf):
+    finite = np.isfinite(points).all(axis=1)
+    joined = finite[:-1] & finite[1:]
+    with np.errstate(invalid='ignore'):
+        joined &= np.abs(np.diff(points[:, 1])) < max_jump
+    return curves.split_runs(points, joined)
+
+
+def curve_set(params=(1, 1, 1)):
+    return [
+        (lambda x: np.column_stack([x, first_func(x, *params)]), -5, 5),
+        (lambda phi: np.column_stack(curves.polar_to_cartesian(phi, second_func(phi, *params))), 0, 2 * np.pi),
+    ]
+
+
+def surface_grid(rows, columns):
+    x, y = np.meshgrid(np.linspace(-9.9, 9.9, columns), np.linspace(-3.2, 1.4, rows))
+    return np.stack([x, fifth_func(x, y), y], axis=-1)
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func(*args)
+        best = min(best, perf_counter() - start)
+    return best, result
@@ -0,0 +1,58 @@
+from math import ceil, sqrt
+
+import numpy as np
+
+FANOUT = 8
+
+
+def _str_order(centres, fanout):
+    count = len(centres)
+    slices = max(1, ceil(sqrt(ceil(count / fanout))))
+    by_x = np.argsort(centres[:, 0], kind='stable')
+    slab = np.empty(count, dtype=np.int64)
+    slab[by_x] = np.arange(count) * slices // count
+    return np.lexsort((centres[:, 1], slab))
+
+
+class EdgeTree:
+    def __init__(self, first, second, fanout=FANOUT):
+        first, second = np.asarray(first, dtype=float), np.asarray(second, dtype=float)
+        self.fanout = fanout
+        self.order = _str_order((first + second) / 2, fanout)
+        lo, hi = np.minimum(first, second)[self.order], np.maximum(first, second)[self.order]
+        span = hi[:, 1].max() - lo[:, 1].min()
+        self.line_density = (hi[:, 1] - lo[:, 1]).sum() / span if span > 0 else float(len(lo))
+        self.levels = [(lo, hi)]
+        while len(lo) > 1:
+            starts = np.arange(0, len(lo), fanout)
+            lo, hi = np.minimum.reduceat(lo, starts), np.maximum.reduceat(hi, starts)
+            self.levels.insert(0, (lo, hi))
+
+    def __len__(self):
+        return len(self.order)
+
+    def query(self, lo, hi):
+        lo, hi = np.asarray(lo, dtype=float).reshape(-1, 2), np.asarray(hi, dtype=float).reshape(-1, 2)
+        queries, nodes = np.arange(len(lo)), np.zeros(len(lo), dtype=np.int64)
+        for depth, (level_lo, level_hi) in enumerate(self.levels):
+            if depth:
+                queries = np.repeat(queries, self.fanout)
+                nodes = (nodes[:, np.newaxis] * self.fanout + np.arange(self.fanout)).ravel()
+                inside = nodes < len(level_lo)
+                queries, nodes = queries[inside], nodes[inside]
+            overlap = ((level_lo[nodes] <= hi[queries]) & (lo[queries] <= level_hi[nodes])).all(axis=1)
+            queries, nodes = queries[overlap], nodes[overlap]
+        edges = self.order[nodes]
+        order = np.lexsort((edges, queries))
+        return queries[order], edges[order]
+
+    def at_points(self, points):
+        return self.query(points, points)
+
+    def along_segments(self, first, second):
+        first, second = np.asarray(first, dtype=float), np.asarray(second, dtype=float)
+        return self.query(np.minimum(first, second), np.maximum(first, second))
+
+    def along_rays(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return self.query(points, np.column_stack([np.full(len(points), np.inf), points[:, 1]]))
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+
+import numpy as np
+
+DEPTH = 40
+ZOOM_SLACK = 2
+
+
+def polar_to_cartesian(phi, r):
+    return r * np.cos(phi), r * np.sin(phi)
+
+
+def split_runs(points, joined):
+    bounds = np.flatnonzero(np.diff(np.concatenate([[0], joined.view(np.int8), [0]])))
+    return [points[start:stop + 1] for start, stop in zip(bounds[::2], bounds[1::2])]
+
+
+def evaluate(curve, t):
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.asarray(curve(t), dtype=float).reshape(-1, 2)
+
+
+def _outcodes(points, bounds):
+    x, y = points[:, 0], points[:, 1]
+    return (x < bounds[0]) | (x > bounds[2]) << 1 | (y < bounds[1]) << 2 | (y > bounds[3]) << 3
+
+
+def adaptive_sample(curve, start, stop, budget, tolerance=0.25, initial=65, bounds=None):
+    t = np.linspace(start, stop, initial)
+    points = evaluate(curve, t)
+    active = np.ones(initial - 1, dtype=bool)
+    broken = np.zeros(initial - 1, dtype=bool)
+    min_width = (stop - start) / (initial - 1) * 2.0 ** -DEPTH
+    max_error = np.inf if bounds is None else np.hypot(bounds[2] - bounds[0], bounds[3] - bounds[1])
+    while active.any():
+        index = np.flatnonzero(active)
+        mid_t = (t[index] + t[index + 1]) / 2
+        mid = evaluate(curve, mid_t)
+        first, second = points[index], points[index + 1]
+        error = np.hypot(*(mid - (first + second) / 2).T)
+        error[np.isnan(error)] = np.inf
+        finite = np.isfinite(first).all(axis=1), np.isfinite(second).all(axis=1), np.isfinite(mid).all(axis=1)
+        dead = ~(finite[0] | finite[1] | finite[2])
+        split = (error > tolerance) & ~dead
+        if bounds is not None:
+            split &= (_outcodes(first, bounds) & _outcodes(second, bounds) & _outcodes(mid, bounds)) == 0
+        tiny = abs(t[index + 1] - t[index]) <= abs(min_width)
+        broken[index] = dead | split & tiny
+        split &= ~tiny
+        room = budget - len(t)
+        if split.sum() > room:
+            worst = np.flatnonzero(split)
+            worst = worst[np.argsort(-error[worst], kind='stable')]
+            split[worst[max(room, 0):]] = False
+            broken[index[worst[max(room, 0):]]] = error[worst[max(room, 0):]] > max_error
+        inserts = index[split] + 1
+        t = np.insert(t, inserts, mid_t[split])
+        points = np.insert(points, inserts, mid[split], axis=0)
+        active = np.zeros_like(active)
+        active[index[split]] = True
+        active = np.insert(active, inserts, True)
+        broken = np.insert(broken, inserts, False)
+    finite = np.isfinite(points).all(axis=1)
+    return t, points, ~broken & finite[:-1] & finite[1:]
+
+
+def trim(t, points, joined, start, stop):
+    first = max(np.searchsorted(t, start, 'right') - 1, 0)
+    last = min(np.searchsorted(t, stop, 'left'), len(t) - 1)
+    t, points, joined = t[first:last + 1].copy(), points[first:last + 1].copy(), joined[first:last]
+    if len(t) > 1:
+        for end, inner, bound in ((0, 1, start), (-1, -2, stop)):
+            if (t[end] - bound) * (t[inner] - bound) < 0:
+                ratio = (bound - t[end]) / (t[inner] - t[end])
+                points[end] += (points[inner] - points[end]) * ratio
+                t[end] = bound
+    return t, points, joined
+
+
+class SampleCache:
+    def __init__(self, size=16):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def clear(self):
+        self._entries.clear()
+
+    @staticmethod
+    def _covers(entry, domain, window, scale):
+        cached_scale, cached_window, t = entry[:3]
+        return (
+            t[0] <= domain[0] and domain[1] <= t[-1]
+            and cached_window[0] <= window[0] and cached_window[1] <= window[1]
+            and window[2] <= cached_window[2] and window[3] <= cached_window[3]
+            and all(s <= cached * ZOOM_SLACK for s, cached in zip(scale, cached_scale))
+        )
+
+    def get(self, key, domain, window, scale, build):
+        entry = self._entries.get(key)
+        if entry is not None and self._covers(entry, domain, window, scale):
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            entry = self._entries[key] = (scale,) + build()
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return trim(*entry[2:], *domain)
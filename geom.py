@@ -1,16 +1,68 @@
 from collections import defaultdict
 from copy import copy
-from math import sqrt
+from itertools import combinations
+from heapq import heappop, heappush
+from math import floor, sqrt
 import numpy as np
-from numpy.linalg import solve, matrix_rank
+from numpy.linalg import det, solve, matrix_rank
+from bvh import EdgeTree
+from predicates import ORIENT_BOUND, collinear, orient2d, orient2d_many, segment_intersection
+import profiling
 EPS = 0.00001
+CONTAINS_CHUNK = 1 << 16
+TREE_EDGES = 128
+TREE_SETUP = 32
+RANK_MARGIN = 48
+FACETS_BLOCK = 16
+OUTSIDE, BOUNDARY, INSIDE = -1, 0, 1
+SAME, OPPOSITE = 2, 3
 
 
 class PointsDict(dict):
+    def __init__(self, items=()):
+        super().__init__()
+        self._cells = defaultdict(list)
+        self._order = 0
+        for k, v in items:
+            self[k] = v
+
+    @staticmethod
+    def _coords(key):
+        return key.x, key.y
+
+    def _cell(self, coords):
+        return floor(coords[0] / EPS), floor(coords[1] / EPS)
+
+    def __setitem__(self, key, value):
+        if not super().__contains__(key):
+            coords = self._coords(key)
+            self._cells[self._cell(coords)].append((self._order, coords, key))
+            self._order += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        cell = self._cells[self._cell(self._coords(key))]
+        cell[:] = [entry for entry in cell if entry[2] is not key]
+
     def __getitem__(self, item):
-        for k, v in self.items():
-            if abs(k.x - item.x) < EPS and abs(k.y - item.y) < EPS:
-                return v
+        coords = self._coords(item)
+        cx, cy = self._cell(coords)
+        best = None
+        for x in (cx - 1, cx, cx + 1):
+            for y in (cy - 1, cy, cy + 1):
+                for order, k_coords, k in self._cells.get((x, y), ()):
+                    dist = max(abs(a - b) for a, b in zip(k_coords, coords))
+                    if dist < EPS and (best is None or (dist, order) < best[:2]):
+                        best = dist, order, k
+        if best is not None:
+            return super().__getitem__(best[2])
+
+
+class SegmentsDict(PointsDict):
+    @staticmethod
+    def _coords(key):
+        return key.first.x, key.first.y, key.second.x, key.second.y
 
 
 class Point2D:
@@ -67,7 +119,6 @@ class Point3D:
 
 class Segment:
     def __init__(self, *args):
-        self.ks = []
         if len(args) == 1:
             args = args[0]
         if len(args) == 2:
@@ -77,196 +128,451 @@ class Segment:
             self.second = Point2D(*args[2:])
         else:
             raise ValueError
-        self.a, self.b, self.c = self.get_ks()
-        if abs(self.a) > EPS:
-            self.b /= self.a
-            self.c /= self.a
-            self.a = 1
-        elif abs(self.b) > EPS:
-            self.a /= self.b
-            self.c /= self.b
-            self.b = 1
-        else:
-            raise ValueError("{} {} {}".format(self.a, self.b, self.c))
-
-    def get_ks(self):
-        return [
-            self.first.y - self.second.y,
-            self.second.x - self.first.x,
-            self.first.x * self.second.y - self.second.x * self.first.y
-        ]
+        if self.first.coords == self.second.coords:
+            raise ValueError("degenerate {}".format(self))
+        self.x_min, self.x_max = min(self.first.x, self.second.x), max(self.first.x, self.second.x)
+        self.y_min, self.y_max = min(self.first.y, self.second.y), max(self.first.y, self.second.y)
 
+    @profiling.counted
     def intersects(self, other):
-        if abs(self.a * other.b - other.a * self.b) < EPS:
-            return None
-        if self.a == 1:
-            y = (other.a * self.c - other.c) / (other.b - other.a * self.b)
-            x = -self.b * y - self.c
-        elif self.b == 1:
-            x = (other.b * self.c - other.c) / (other.a - self.a * other.b)
-            y = -self.a * x - self.c
-        else:
-            raise ValueError
-        suggested_point = Point2D(x, y)
-        if suggested_point in self and suggested_point in other:
-            return suggested_point
+        point = segment_intersection(self.first.coords, self.second.coords, other.first.coords, other.second.coords)
+        if point is not None:
+            return Point2D(point)
+
+    def collinear(self, other):
+        return collinear(self.first.coords, self.second.coords, other.first.coords, other.second.coords)
 
+    @profiling.counted
     def __contains__(self, point):
-        if abs(self.a * point.x + self.b * point.y + self.c) > EPS:
+        x, y = point.x, point.y
+        if not (self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max):
             return False
-        flag0 = min(self.first.x, self.second.x) <= point.x <= max(self.first.x, self.second.x)
-        flag1 = min(self.first.y, self.second.y) <= point.y <= max(self.first.y, self.second.y)
-        return flag0 and flag1
+        first, second = self.first, self.second
+        left = (first.x - x) * (second.y - y)
+        right = (first.y - y) * (second.x - x)
+        if abs(left - right) >= ORIENT_BOUND * (abs(left) + abs(right)):
+            return left == right
+        return orient2d(first.coords, second.coords, point.coords) == 0
 
     def __repr__(self):
         return "Segment({}, {})".format(self.first, self.second)
 
 
+def sweep_pairs(first, second):
+    boxes = sorted(
+        (seg.x_min, seg.x_max, seg.y_min, seg.y_max, side, i)
+        for side, segments in enumerate((first, second)) for i, seg in enumerate(segments)
+    )
+    active = [], []
+    for x_min, x_max, y_min, y_max, side, i in boxes:
+        opposite = active[1 - side]
+        while opposite and opposite[0][0] < x_min:
+            heappop(opposite)
+        for _, o_y_min, o_y_max, j in opposite:
+            if o_y_min <= y_max and y_min <= o_y_max:
+                yield (i, j) if side == 0 else (j, i)
+        heappush(active[side], (x_max, y_min, y_max, i))
+
+
+def _ray_hits(x0, y0, x1, y1, px, py):
+    side = orient2d_many(x0, y0, x1, y1, px, py)
+    boundary = ((side == 0)
+                & (np.minimum(x0, x1) <= px) & (px <= np.maximum(x0, x1))
+                & (np.minimum(y0, y1) <= py) & (py <= np.maximum(y0, y1)))
+    crossings = ((y0 <= py) & (py < y1) & (side > 0)) | ((y1 <= py) & (py < y0) & (side < 0))
+    return boundary, crossings
+
+
+def _to_points(vertices):
+    return [Point2D(x, y) for x, y in vertices.tolist()]
+
+
 class Polygon:
-    def __init__(self, points):
-        self.points = []
-        if type(points[0]) == Point2D:
-            self.points = points
+    def __init__(self, points, compact=False):
+        if isinstance(points, np.ndarray):
+            vertices, points = points, None
+        elif type(points[0]) == Point2D:
+            vertices = [p.coords for p in points]
         elif type(points[0]) == int:
             if len(points) % 2 == 1:
                 raise ValueError
             it = iter(points)
-            self.points = list(map(Point2D, zip(it, it)))
+            points = list(map(Point2D, zip(it, it)))
+            vertices = [p.coords for p in points]
         else:
             raise ValueError
-        self.segments = self.get_segments()
-        self.get_index_by_segment = PointsDict([(self.segments[i], i) for i in range(len(self.segments))])
-        self.get_index_by_point = PointsDict([(self.points[i], i) for i in range(len(self.points))])
-        self._pure_points = copy(self.points)
-        self.epoints = []
+        self._reset(vertices, None if compact else points)
+
+    def _reset(self, vertices, points):
+        self.vertices = np.ascontiguousarray(vertices, dtype=float).reshape(-1, 2)
+        self._points = points
+        self._pure_points = None if points is None else copy(points)
+        self._segments = None
+        self._point_index = None
+        self._segment_index = None
+        self._edges = None
+        self._tree = None
 
     def __repr__(self):
         return "Polygon({})".format(", ".join(str(p) for p in self.points))
 
+    @property
+    def points(self):
+        if self._points is None:
+            self._points = _to_points(self.vertices)
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._reset([p.coords for p in points], points)
+
     @property
     def pure_points(self):
+        if self._pure_points is None:
+            self._pure_points = _to_points(self.vertices)
         return self._pure_points
 
-    def extend_points(self, other):
-        for seg in self.segments:
-            int_points = sorted(other.intersects_with(seg), key=lambda p: p.dto(seg.first))
-            self.epoints.append(seg.first)
-            self.epoints.extend(int_points)
-        self.segments = self.get_segments()
-        self.points = self.epoints
-        self.get_index_by_segment = PointsDict([(self.segments[i], i) for i in range(len(self.segments))])
-        self.get_index_by_point = PointsDict([(self.points[i], i) for i in range(len(self.points))])
+    @property
+    def segments(self):
+        if self._segments is None:
+            points = self.pure_points
+            self._segments = list(map(Segment, zip(points[:-1], points[1:]))) + [Segment(points[-1], points[0])]
+        return self._segments
+
+    @property
+    def get_index_by_point(self):
+        if self._point_index is None:
+            self._point_index = PointsDict([(self.points[i], i) for i in range(len(self.points))])
+        return self._point_index
+
+    @property
+    def get_index_by_segment(self):
+        if self._segment_index is None:
+            self._segment_index = SegmentsDict([(self.segments[i], i) for i in range(len(self.segments))])
+        return self._segment_index
 
     def intersects_with(self, segment: Segment):
         int_points = []
-        for seg in self.segments:
+        for seg in self._segments_near(segment.first.coords, segment.second.coords):
             int_point = segment.intersects(seg)
             if int_point is not None:
                 int_points.append(int_point)
         return int_points
 
-    def get_segments(self):
-        return list(map(Segment, zip(self.points[:-1], self.points[1:]))) + [Segment(self.points[-1], self.points[0])]
+    def edge_arrays(self):
+        if self._edges is None:
+            first, second = self.vertices.T, np.roll(self.vertices, -1, axis=0).T
+            self._edges = tuple(e[np.newaxis, :] for e in (*first, *second))
+        return self._edges
+
+    @property
+    def edge_tree(self):
+        if self._tree is None:
+            self._tree = EdgeTree(self.vertices, np.roll(self.vertices, -1, axis=0))
+        return self._tree
+
+    def _segments_near(self, first, second):
+        if len(self.vertices) < TREE_EDGES:
+            return self.segments
+        _, edges = self.edge_tree.along_segments([first], [second])
+        return [self.segments[i] for i in edges.tolist()]
+
+    def locate_many(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        result = np.empty(len(points), dtype=np.int8)
+        if len(self.vertices) * len(points) >= TREE_EDGES * (len(points) + TREE_SETUP):
+            tree, following = self.edge_tree, np.roll(self.vertices, -1, axis=0)
+            step = max(1, int(CONTAINS_CHUNK // (tree.line_density * tree.fanout + 1)))
+            for start in range(0, len(points), step):
+                chunk = points[start:start + step]
+                queries, edges = tree.along_rays(chunk)
+                (x0, y0), (x1, y1) = self.vertices[edges].T, following[edges].T
+                boundary, crossings = _ray_hits(x0, y0, x1, y1, *chunk[queries].T)
+                on_boundary = np.bincount(queries[boundary], minlength=len(chunk)) > 0
+                inside = np.where(np.bincount(queries[crossings], minlength=len(chunk)) % 2 == 1, INSIDE, OUTSIDE)
+                result[start:start + step] = np.where(on_boundary, BOUNDARY, inside)
+            return result
+        x0, y0, x1, y1 = self.edge_arrays()
+        step = max(1, CONTAINS_CHUNK // x0.shape[1])
+        for start in range(0, len(points), step):
+            px, py = points[start:start + step, :, np.newaxis].transpose(1, 0, 2)
+            boundary, crossings = _ray_hits(x0, y0, x1, y1, px, py)
+            inside = np.where(np.count_nonzero(crossings, axis=1) % 2 == 1, INSIDE, OUTSIDE)
+            result[start:start + step] = np.where(boundary.any(axis=1), BOUNDARY, inside)
+        return result
+
+    def contains_many(self, points):
+        return self.locate_many(points) != OUTSIDE
 
     def __contains__(self, item):
-        for seg in self.segments:
-            if item in seg:
-                return True
-        inf = Point2D(1234567890, 999999999)
-        return len(list(filter(lambda x: x.intersects(Segment(item, inf)) is not None, self.segments))) % 2 == 1
+        return bool(self.contains_many(item.coords)[0])
 
     def find_segment_by_point(self, point):
-        for seg in self.segments:
+        for seg in self._segments_near(point.coords, point.coords):
             if point in seg:
                 return seg
 
-    def _find_start_point(self, other, used):
-        for point in self.points:
-            if (point not in other) and (point not in used):
-                return point
-
-    def _find_chain(self, start_point, other, result, used):
-        i = self.get_index_by_point[start_point]
-        while self.epoints[i] not in other:
-            if self.epoints[i] in used:
-                return None
-            result[-1].append(self.epoints[i])
-            used.add(self.epoints[i])
-            i = (i + 1) % len(self.epoints)
-        result[-1].append(self.epoints[i])
-        used.add(self.epoints[i])
-        i = other.get_index_by_point[self.epoints[i]]
-        i -= 1
-        while other.epoints[i] in self:
-            result[-1].append(other.epoints[i])
-            # used.add(other.epoints[i])
-            i -= 1
-        used.add(other.epoints[i + 1])
-        index = self.get_index_by_point[other.epoints[i + 1]]
-        return self.epoints[(index + 1) % len(self.epoints)]
-
-    def _find_cycle(self, other, used, result):
-        result.append([])
-        start_point = self._find_start_point(other, used)
-        while start_point is not None:
-            start_point = self._find_chain(start_point, other, result, used)
-        if not result[-1]:
-            result.pop(-1)
-            return False
-        else:
-            return True
-
-    def __sub__(self, other):
-        self.extend_points(other)
-        other.extend_points(self)
-        if all(map(lambda p: p in other, self.points)):
-            return []
-        if all(map(lambda p: p in self, other.points)):
-            return [self, other]
-        result = []
-        used = set()
-        while self._find_cycle(other, used, result):
-            pass
-        return list(map(Polygon, result))
+    def signed_area(self):
+        x, y = self.vertices.T
+        return (x.dot(np.roll(y, -1)) - y.dot(np.roll(x, -1))) / 2
+
+    @profiling.span
+    def difference(self, other):
+        return Clipper(self, other).difference()
+
+    @profiling.span
+    def union(self, other):
+        return Clipper(self, other).union()
+
+    @profiling.span
+    def intersection(self, other):
+        return Clipper(self, other).intersection()
+
+    @profiling.span
+    def symmetric_difference(self, other):
+        return Clipper(self, other).symmetric_difference()
+
+    __sub__ = difference
+    __or__ = union
+    __and__ = intersection
+    __xor__ = symmetric_difference
+
+
+def _split_ring(segments, hits):
+    ring, sources = [], []
+    for i, seg in enumerate(segments):
+        ring.append(seg.first)
+        sources.append(i)
+        for point in sorted(hits[i], key=seg.first.dto):
+            if point != ring[-1] and point != seg.second:
+                ring.append(point)
+                sources.append(i)
+    if len(ring) > 1 and ring[-1] == ring[0]:
+        ring.pop()
+        sources.pop()
+    return ring, sources
+
+
+def _chain(fragments):
+    starts = defaultdict(list)
+    for k, (start, _) in enumerate(fragments):
+        starts[start].append(k)
+    used = [False] * len(fragments)
+    rings = []
+    for k in range(len(fragments)):
+        ring = []
+        while k is not None and not used[k]:
+            used[k] = True
+            if not ring or ring[-1] != fragments[k][0]:
+                ring.append(fragments[k][0])
+            k = next((m for m in starts.get(fragments[k][1], ()) if not used[m]), None)
+        while len(ring) > 1 and ring[-1] == ring[0]:
+            ring.pop()
+        if len(ring) >= 3:
+            rings.append(ring)
+    return rings
+
+
+class Clipper:
+    OPERATIONS = {
+        'intersection': ((INSIDE, SAME), (INSIDE,), False),
+        'union': ((OUTSIDE, SAME), (OUTSIDE,), False),
+        'difference': ((OUTSIDE, OPPOSITE), (INSIDE,), True),
+    }
+
+    def __init__(self, subject, clip):
+        self.subject = subject
+        self.clip = clip
+        self._graph = None
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            polygons = self.subject, self.clip
+            hits = defaultdict(list), defaultdict(list)
+            overlaps = defaultdict(list), defaultdict(list)
+            subject_segments, clip_segments = self.subject.segments, self.clip.segments
+            for i, j in sweep_pairs(subject_segments, clip_segments):
+                first, second = subject_segments[i], clip_segments[j]
+                point = first.intersects(second)
+                if point is not None:
+                    hits[0][i].append(point)
+                    hits[1][j].append(point)
+                elif first.collinear(second):
+                    overlaps[0][i].append(j)
+                    overlaps[1][j].append(i)
+                hits[0][i].extend(p for p in (second.first, second.second) if p in first)
+                hits[1][j].extend(p for p in (first.first, first.second) if p in second)
+            signs = [1 if p.signed_area() > 0 else -1 for p in polygons]
+            crossed = {p.coords for side in hits for points in side.values() for p in points}
+            self._graph = []
+            for k, (polygon, other) in enumerate(zip(polygons, polygons[::-1])):
+                ring, sources = _split_ring(polygon.segments, hits[k])
+                if signs[k] < 0:
+                    ring.reverse()
+                    sources = sources[-2::-1] + sources[-1:]
+                partners = [overlaps[k][i] for i in sources]
+                plain = [p.coords not in crossed for p in ring]
+                self._graph.append(self._label(ring, partners, plain, other, signs[1 - k]))
+        return self._graph
+
+    @staticmethod
+    def _overlap_label(a, b, segments, other_sign):
+        mx, my = (a.x + b.x) / 2, (a.y + b.y) / 2
+        dx, dy = b.x - a.x, b.y - a.y
+        for seg in segments:
+            before = (seg.first.x - mx) * dx + (seg.first.y - my) * dy
+            after = (seg.second.x - mx) * dx + (seg.second.y - my) * dy
+            if before * after < 0:
+                return SAME if (after - before) * other_sign > 0 else OPPOSITE
+
+    @classmethod
+    def _label(cls, ring, partners, plain, other, other_sign):
+        fragments, labels, runs, run = [], [], [], 0
+        for a, b, segments, joint in zip(ring, ring[1:] + ring[:1], partners, plain[1:] + plain[:1]):
+            fragments.append((a, b))
+            labels.append(cls._overlap_label(a, b, [other.segments[j] for j in segments], other_sign))
+            runs.append(run)
+            run += not joint
+        if fragments and plain[0]:
+            runs = [0 if run == runs[-1] else run for run in runs]
+        longest = {}
+        for k, ((a, b), label) in enumerate(zip(fragments, labels)):
+            if label is None and a.dto(b) > longest.get(runs[k], (-1, None))[0]:
+                longest[runs[k]] = a.dto(b), k
+        picked = [k for _, k in longest.values()]
+        middles = [((fragments[k][0].x + fragments[k][1].x) / 2, (fragments[k][0].y + fragments[k][1].y) / 2) for k in picked]
+        located = dict(zip((runs[k] for k in picked), other.locate_many(middles).tolist() if picked else []))
+        for k, middle in zip(picked, middles):
+            if located[runs[k]] == BOUNDARY:
+                (a, b), seg = fragments[k], other.find_segment_by_point(Point2D(middle))
+                direction = (b.x - a.x) * (seg.second.x - seg.first.x) + (b.y - a.y) * (seg.second.y - seg.first.y)
+                located[runs[k]] = SAME if direction * other_sign > 0 else OPPOSITE
+        return [(fragment, located[run] if label is None else label)
+                for fragment, label, run in zip(fragments, labels, runs)]
+
+    def _select(self, operation, reverse_roles=False):
+        own, other, reverse = self.OPERATIONS[operation]
+        first, second = self.graph[::-1] if reverse_roles else self.graph
+        fragments = [fragment for fragment, label in first if label in own]
+        for (a, b), label in second:
+            if label in other:
+                fragments.append((b, a) if reverse else (a, b))
+        return _chain(fragments)
+
+    def _result(self, rings):
+        return [Polygon(ring) for ring in rings]
+
+    def difference(self):
+        return self._result(self._select('difference'))
+
+    def union(self):
+        return self._result(self._select('union'))
+
+    def intersection(self):
+        return self._result(self._select('intersection'))
+
+    def symmetric_difference(self):
+        return self._result(self._select('difference') + self._select('difference', reverse_roles=True))
+
+
+def _vertex_candidates(matrix):
+    s = matrix.shape[1]
+    for i in range(s - 2):
+        j, k = np.triu_indices(s - i - 1, 1)
+        point_ms = matrix.T[np.stack([np.full_like(j, i), j + i + 1, k + i + 1], axis=1)]
+        base_ms = point_ms[:, :, :3]
+        full_rank = abs(det(base_ms)) > RANK_MARGIN * np.finfo(float).eps * (base_ms ** 2).sum(axis=(1, 2)) ** 1.5
+        unsure = ~full_rank
+        if unsure.any():
+            full_rank[unsure] = matrix_rank(base_ms[unsure]) == 3
+        point_ms = point_ms[full_rank]
+        if not len(point_ms):
+            continue
+        coords = solve(point_ms[:, :, :3], -point_ms[:, :, 3:])[:, :, 0]
+        homogeneous = np.hstack([coords, np.ones((len(coords), 1))])
+        inside = np.arange(len(coords))
+        for start in range(0, s, FACETS_BLOCK):
+            block = matrix[:, start:start + FACETS_BLOCK]
+            inside = inside[(homogeneous[inside].dot(block) >= -EPS).all(axis=1)]
+        yield coords[inside]
 
 
 class Solid:
+    @profiling.span
     def __init__(self, matrix):
         self.matrix = matrix
-        self.points = []
-        self.edges = {}
-        s = matrix.shape[1]
-        point_to_facets = defaultdict(set)
-        for i in range(s):
-            for j in range(i, s):
-                for k in range(j, s):
-                    point_m = np.array([matrix[:, i], matrix[:, j], matrix[:, k]])
-                    base_m = point_m[:, 0:3]
-                    free_c = -point_m[:, 3]
-                    if matrix_rank(base_m) == 3:
-                        point = Point3D(solve(base_m, free_c))
-                        if np.array(point.coords + (1,)) in self:
-                            self.points.append(point)
-                            point_to_facets[point] = point_to_facets[point].union(set(map(tuple, point_m)))
-        for i in range(len(self.points)):
-            for j in range(i + 1, len(self.points)):
-                if len(point_to_facets[self.points[i]].intersection(point_to_facets[self.points[j]])) >= 2:
-                    key = tuple(sorted(point_to_facets[self.points[i]].intersection(point_to_facets[self.points[j]])))
-                    self.edges[key] = self.points[i], self.points[j]
-        self.ptf = point_to_facets
+        coords = np.vstack([np.empty((0, 3))] + list(_vertex_candidates(matrix)))
+        tight = abs(np.hstack([coords, np.ones((len(coords), 1))]).dot(matrix)) <= EPS
+        _, first = np.unique(tight, axis=0, return_index=True)
+        first.sort()
+        self.vertices = coords[first]
+        self.vertex_facets = [frozenset(np.flatnonzero(row).tolist()) for row in tight[first]]
+        facet_pairs = defaultdict(list)
+        for v, facets in enumerate(self.vertex_facets):
+            for pair in combinations(sorted(facets), 2):
+                facet_pairs[pair].append(v)
+        edges = {}
+        for pair, vs in facet_pairs.items():
+            if len(vs) == 2:
+                edges.setdefault(tuple(vs), pair)
+        self.edge_vertices = np.array(list(edges), dtype=int).reshape(-1, 2)
+        self.edge_facets = np.array(list(edges.values()), dtype=int).reshape(-1, 2)
+        self._reset()
+
+    def _reset(self):
+        self._points = None
+        self._ptf = None
+        self._edges = None
+
+    @property
+    def points(self):
+        if self._points is None:
+            self._points = [Point3D(v) for v in self.vertices]
+        return self._points
+
+    @property
+    def ptf(self):
+        if self._ptf is None:
+            self._ptf = {p: set(facets) for p, facets in zip(self.points, self.vertex_facets)}
+        return self._ptf
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            self._edges = {
+                (f, g): (self.points[a], self.points[b])
+                for (a, b), (f, g) in zip(self.edge_vertices.tolist(), self.edge_facets.tolist())
+            }
+        return self._edges
+
+    def transformed(self, transform):
+        solid = copy(self)
+        solid.matrix = np.linalg.inv(transform).T.dot(self.matrix)
+        homogeneous = np.hstack([self.vertices, np.ones((len(self.vertices), 1))]).dot(transform.T)
+        solid.vertices = homogeneous[:, :3] / homogeneous[:, 3:]
+        solid._reset()
+        return solid
 
     def __contains__(self, point):
         return all(x >= -EPS for x in point.dot(self.matrix))
 
+    def back_facets(self, view_point):
+        return np.asarray(view_point).dot(self.matrix) > 0
+
+    def visible_edge_mask(self, view_point):
+        back = self.back_facets(view_point)
+        return ~(back[self.edge_facets[:, 0]] & back[self.edge_facets[:, 1]])
+
+    def _edges_by_mask(self, mask):
+        points = self.points
+        return [(points[a], points[b]) for a, b in self.edge_vertices[mask].tolist()]
+
     def get_invisible_edges(self, view_point):
-        invisible_indexes = [i for i in range(self.matrix.shape[1]) if view_point.dot(self.matrix)[i] < 0]
-        for i in range(len(invisible_indexes)):
-            for j in range(i + 1, len(invisible_indexes)):
-                key = tuple(sorted(map(tuple, [self.matrix[:, invisible_indexes[i]], self.matrix[:, invisible_indexes[j]]])))
-                yield self.edges[key]
+        return self._edges_by_mask(~self.visible_edge_mask(-np.asarray(view_point)))
 
     def get_visible_edges(self, view_point):
-        return list(set(self.edges.values()) - set(self.get_invisible_edges(-view_point)))
+        return self._edges_by_mask(self.visible_edge_mask(view_point))
 
 
 def main():
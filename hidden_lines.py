@@ -0,0 +1,140 @@
+import numpy as np
+
+from geom import EPS
+
+PAIRS_CHUNK = 1 << 14
+
+
+class BucketGrid:
+    def __init__(self, lo, hi, cell):
+        self.cell = cell
+        self.size = len(lo)
+        self.origin = np.minimum(lo.min(axis=0), 0)
+        items, keys = self._cells(lo, hi)
+        order = np.argsort(keys, kind='stable')
+        self.items, self.keys = items[order], keys[order]
+
+    def _cells(self, lo, hi):
+        first = np.floor((lo - self.origin) / self.cell).astype(np.int64)
+        last = np.floor((hi - self.origin) / self.cell).astype(np.int64)
+        size = last - first + 1
+        counts = size.prod(axis=1)
+        items = np.repeat(np.arange(len(lo)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        x = first[items, 0] + local % size[items, 0]
+        y = first[items, 1] + local // size[items, 0]
+        return items, (x << 32) + y
+
+    def pairs(self, lo, hi):
+        queries, keys = self._cells(lo, hi)
+        start = np.searchsorted(self.keys, keys, 'left')
+        counts = np.searchsorted(self.keys, keys, 'right') - start
+        queries = np.repeat(queries, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        items = self.items[np.repeat(start, counts) + offsets]
+        unique = np.unique(queries * self.size + items)
+        return unique % self.size, unique // self.size
+
+
+class SolidSet:
+    def __init__(self, solids):
+        facets = [solid.matrix.shape[1] for solid in solids]
+        sizes = [len(solid.vertices) for solid in solids]
+        facet_start, vertex_start = np.cumsum([0] + facets[:-1]), np.cumsum([0] + sizes[:-1])
+        self.count = len(solids)
+        self.matrix = np.hstack([solid.matrix for solid in solids])
+        self.vertices = np.vstack([solid.vertices for solid in solids])
+        self.edge_vertices = np.vstack([s.edge_vertices + v for s, v in zip(solids, vertex_start)])
+        self.edge_facets = np.vstack([s.edge_facets + f for s, f in zip(solids, facet_start)])
+        self.facet_owner = np.repeat(np.arange(self.count), facets)
+        self.vertex_owner = np.repeat(np.arange(self.count), sizes)
+        self.edge_owner = self.facet_owner[self.edge_facets[:, 0]]
+        self.centres = np.array([solid.vertices.mean(axis=0) for solid in solids])
+
+    def shadow_planes(self, view_point, back):
+        silhouette = back[self.edge_facets[:, 0]] != back[self.edge_facets[:, 1]]
+        first, second = self.vertices[self.edge_vertices[silhouette]].transpose(1, 0, 2)
+        owners = self.edge_owner[silhouette]
+        normals = np.cross(second - first, view_point[:3])
+        offsets = -(normals * first).sum(axis=1)
+        flip = (normals * self.centres[owners]).sum(axis=1) + offsets < 0
+        normals[flip] *= -1
+        offsets[flip] *= -1
+        planes = np.vstack([self.matrix[:, ~back].T, np.column_stack([normals, offsets])])
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        owners = np.concatenate([self.facet_owner[~back], owners])
+        order = np.argsort(owners, kind='stable')
+        planes, owners = planes[order], owners[order]
+        counts = np.bincount(owners, minlength=self.count)
+        rank = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+        padded = np.zeros((self.count, counts.max(), 4))
+        padded[..., 3] = 1
+        padded[owners, rank] = planes
+        return padded
+
+
+def hidden_intervals(first, second, planes):
+    start = np.einsum('pk,pqk->pq', first, planes[..., :3]) + planes[..., 3] - EPS
+    slope = np.einsum('pk,pqk->pq', second - first, planes[..., :3])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing = -start / slope
+    lo = np.maximum(np.where(slope > 0, crossing, -np.inf).max(axis=1), 0)
+    hi = np.minimum(np.where(slope < 0, crossing, np.inf).min(axis=1), 1)
+    blocked = ((slope == 0) & (start <= 0)).any(axis=1)
+    return (lo < hi) & ~blocked, lo, hi
+
+
+def visible_pieces(count, edges, lo, hi):
+    order = np.lexsort((lo, edges))
+    edges, lo, hi = edges[order], lo[order], hi[order]
+    reach = np.maximum.accumulate(hi + 2 * edges) - 2 * edges
+    first = np.r_[True, edges[1:] != edges[:-1]]
+    before = np.where(first, 0, np.r_[0, reach[:-1]])
+    last = np.r_[edges[1:] != edges[:-1], True]
+    untouched = np.setdiff1d(np.arange(count), edges)
+    gaps = lo > before
+    tails = last & (reach < 1)
+    pieces = np.concatenate([
+        np.column_stack([untouched, np.zeros(len(untouched)), np.ones(len(untouched))]),
+        np.column_stack([edges[gaps], before[gaps], lo[gaps]]),
+        np.column_stack([edges[tails], reach[tails], np.ones(tails.sum())]),
+    ])
+    return pieces[pieces[:, 2] - pieces[:, 1] > EPS]
+
+
+def visible_segments(solids, view_point, projection):
+    if not solids:
+        return np.zeros((0, 2, 2))
+    view_point = np.asarray(view_point, dtype=float)
+    scene = SolidSet(solids)
+    back = view_point.dot(scene.matrix) > 0
+    shown = ~(back[scene.edge_facets[:, 0]] & back[scene.edge_facets[:, 1]])
+    segments = scene.vertices[scene.edge_vertices[shown]]
+    owners = scene.edge_owner[shown]
+    flat = segments.dot(projection)
+    projected = scene.vertices.dot(projection)
+    box_lo = np.full((scene.count, 2), np.inf)
+    box_hi = np.full((scene.count, 2), -np.inf)
+    np.minimum.at(box_lo, scene.vertex_owner, projected)
+    np.maximum.at(box_hi, scene.vertex_owner, projected)
+    edge_lo, edge_hi = flat.min(axis=1), flat.max(axis=1)
+    grid = BucketGrid(edge_lo, edge_hi, max(np.median((box_hi - box_lo).max(axis=1)), EPS))
+    edges, occluders = grid.pairs(box_lo, box_hi)
+    keep = (
+        (owners[edges] != occluders)
+        & (edge_lo[edges] <= box_hi[occluders]).all(axis=1)
+        & (box_lo[occluders] <= edge_hi[edges]).all(axis=1)
+    )
+    edges, occluders = edges[keep], occluders[keep]
+    planes = scene.shadow_planes(view_point, back)
+    hidden = []
+    for chunk in range(0, len(edges), PAIRS_CHUNK):
+        part = edges[chunk:chunk + PAIRS_CHUNK]
+        first, second = segments[part].transpose(1, 0, 2)
+        mask, lo, hi = hidden_intervals(first, second, planes[occluders[chunk:chunk + PAIRS_CHUNK]])
+        hidden.append((part[mask], lo[mask], hi[mask]))
+    hidden = [np.concatenate(column) for column in zip(*hidden)] if hidden else [np.zeros(0, dtype=int)] * 3
+    pieces = visible_pieces(len(flat), *hidden)
+    edge = pieces[:, 0].astype(int)
+    start, direction = flat[edge, 0], flat[edge, 1] - flat[edge, 0]
+    return np.stack([start + direction * pieces[:, 1:2], start + direction * pieces[:, 2:3]], axis=1)
@@ -0,0 +1,111 @@
+import numpy as np
+
+EPSILON = float(np.finfo(float).eps) / 2
+ORIENT_BOUND = (3 + 16 * EPSILON) * EPSILON
+SPLITTER = 2.0 ** 27 + 1
+
+
+def _two_sum(a, b):
+    x = a + b
+    virtual = x - a
+    return x, (a - (x - virtual)) + (b - virtual)
+
+
+def _two_diff(a, b):
+    x = a - b
+    virtual = a - x
+    return x, (a - (x + virtual)) + (virtual - b)
+
+
+def _split(a):
+    c = SPLITTER * a
+    high = c - (c - a)
+    return high, a - high
+
+
+def _two_product(a, b):
+    x = a * b
+    (a_high, a_low), (b_high, b_low) = _split(a), _split(b)
+    error = ((x - a_high * b_high) - a_low * b_high) - a_high * b_low
+    return x, a_low * b_low - error
+
+
+def _two_two_diff(a1, a0, b1, b0):
+    i, x0 = _two_diff(a0, b0)
+    j, k = _two_sum(a1, i)
+    i, x1 = _two_diff(k, b1)
+    x3, x2 = _two_sum(j, i)
+    return x3, x2, x1, x0
+
+
+def _exact_orient(ax, ay, bx, by, cx, cy):
+    (acx, acx_tail), (bcx, bcx_tail) = _two_diff(ax, cx), _two_diff(bx, cx)
+    (acy, acy_tail), (bcy, bcy_tail) = _two_diff(ay, cy), _two_diff(by, cy)
+    if not (acx_tail or bcx_tail or acy_tail or bcy_tail):
+        for value in _two_two_diff(*_two_product(acx, bcy), *_two_product(acy, bcx)):
+            if value:
+                return int(value > 0) - int(value < 0)
+        return 0
+    ratios = [value.as_integer_ratio() for value in (ax, ay, bx, by, cx, cy)]
+    scale = max(denominator for _, denominator in ratios)
+    ax, ay, bx, by, cx, cy = (numerator * (scale // denominator) for numerator, denominator in ratios)
+    det = (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+    return int(det > 0) - int(det < 0)
+
+
+def _exact_orient_many(ax, ay, bx, by, cx, cy):
+    (acx, acx_tail), (bcx, bcx_tail) = _two_diff(ax, cx), _two_diff(bx, cx)
+    (acy, acy_tail), (bcy, bcy_tail) = _two_diff(ay, cy), _two_diff(by, cy)
+    expansion = np.array(_two_two_diff(*_two_product(acx, bcy), *_two_product(acy, bcx)))
+    leading = expansion[np.argmax(expansion != 0, axis=0), np.arange(expansion.shape[1])]
+    sign = np.sign(leading).astype(np.int8)
+    for k in np.flatnonzero((acx_tail != 0) | (bcx_tail != 0) | (acy_tail != 0) | (bcy_tail != 0)).tolist():
+        sign[k] = _exact_orient(ax[k], ay[k], bx[k], by[k], cx[k], cy[k])
+    return sign
+
+
+def orient2d(a, b, c):
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    left = (ax - cx) * (by - cy)
+    right = (ay - cy) * (bx - cx)
+    det = left - right
+    if abs(det) >= ORIENT_BOUND * (abs(left) + abs(right)):
+        return int(det > 0) - int(det < 0)
+    return _exact_orient(ax, ay, bx, by, cx, cy)
+
+
+def orient2d_many(ax, ay, bx, by, cx, cy):
+    left = (ax - cx) * (by - cy)
+    right = (ay - cy) * (bx - cx)
+    det = left - right
+    sign = np.sign(det).astype(np.int8)
+    unsure = np.abs(det) < ORIENT_BOUND * (np.abs(left) + np.abs(right))
+    if unsure.any():
+        sign[unsure] = _exact_orient_many(*(np.broadcast_to(v, sign.shape)[unsure] for v in (ax, ay, bx, by, cx, cy)))
+    return sign
+
+
+def in_box(p, a, b):
+    x, y = p
+    return (a[0] <= x <= b[0] or b[0] <= x <= a[0]) and (a[1] <= y <= b[1] or b[1] <= y <= a[1])
+
+
+def collinear(p1, p2, q1, q2):
+    return orient2d(p1, p2, q1) == 0 and orient2d(p1, p2, q2) == 0
+
+
+def segment_intersection(p1, p2, q1, q2):
+    o1, o2 = orient2d(p1, p2, q1), orient2d(p1, p2, q2)
+    if o1 == o2 != 0:
+        return None
+    o3, o4 = orient2d(q1, q2, p1), orient2d(q1, q2, p2)
+    if o3 == o4 != 0 or o1 == o2 == 0:
+        return None
+    for side, point, a, b in ((o1, q1, p1, p2), (o2, q2, p1, p2), (o3, p1, q1, q2), (o4, p2, q1, q2)):
+        if side == 0:
+            return point if in_box(point, a, b) else None
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    ex, ey = q2[0] - q1[0], q2[1] - q1[1]
+    t = ((q1[0] - p1[0]) * ey - (q1[1] - p1[1]) * ex) / (dx * ey - dy * ex)
+    t = min(max(t, 0.0), 1.0)
+    return p1[0] + t * dx, p1[1] + t * dy
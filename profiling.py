@@ -0,0 +1,148 @@
+import atexit
+import csv
+import json
+import os
+import sys
+from collections import Counter, deque
+from functools import wraps
+from time import perf_counter
+
+ENV_VAR = 'CG_PROFILE'
+HISTORY = 600
+_hooks = []
+_seconds = Counter()
+_calls = Counter()
+frames = deque(maxlen=HISTORY)
+enabled = False
+
+
+def _timed(func):
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            _seconds[name] += elapsed
+            _calls[name] += 1
+    return wrapper
+
+
+def _counting(func):
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        _calls[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _hook(wrap):
+    def decorator(func):
+        _hooks.append([func, wrap, None])
+        return func
+    return decorator
+
+
+span = _hook(_timed)
+counted = _hook(_counting)
+
+
+def _owner(func):
+    owner = sys.modules[func.__module__]
+    for name in func.__qualname__.split('.')[:-1]:
+        owner = getattr(owner, name)
+    return owner
+
+
+def _swap(wrapped):
+    for func, _, wrapper in _hooks:
+        owner = _owner(func)
+        source, target = (func, wrapper) if wrapped else (wrapper, func)
+        for name, value in list(vars(owner).items()):
+            if value is source:
+                setattr(owner, name, target)
+
+
+def enable():
+    global enabled
+    if not enabled:
+        for hook in _hooks:
+            hook[2] = hook[2] or hook[1](hook[0])
+        _swap(True)
+        reset()
+        enabled = True
+
+
+def disable():
+    global enabled
+    if enabled:
+        _swap(False)
+        enabled = False
+
+
+def toggle():
+    (disable if enabled else enable)()
+    return enabled
+
+
+def reset():
+    _seconds.clear()
+    _calls.clear()
+    frames.clear()
+
+
+def end_frame(seconds):
+    frames.append({
+        'ms': seconds * 1000,
+        'spans': {name: total * 1000 for name, total in _seconds.items()},
+        'calls': dict(_calls),
+    })
+    _seconds.clear()
+    _calls.clear()
+
+
+def summary(last=60):
+    recent = list(frames)[-last:]
+    if not recent:
+        return {'frames': 0, 'spans': {}, 'calls': {}}
+    spans, calls = Counter(), Counter()
+    for record in recent:
+        spans.update(record['spans'])
+        calls.update(record['calls'])
+    return {
+        'frames': len(recent),
+        'spans': {name: total / len(recent) for name, total in spans.most_common()},
+        'calls': {name: total / len(recent) for name, total in calls.items()},
+    }
+
+
+def export_json(path):
+    with open(path, 'w') as file:
+        json.dump(list(frames), file, indent=1)
+
+
+def export_csv(path):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['frame', 'name', 'calls', 'ms'])
+        for index, record in enumerate(frames):
+            writer.writerow([index, 'frame', 1, record['ms']])
+            for name, calls in sorted(record['calls'].items()):
+                writer.writerow([index, name, calls, record['spans'].get(name, '')])
+
+
+def export(path):
+    (export_csv if path.endswith('.csv') else export_json)(path)
+
+
+def from_env():
+    value = os.environ.get(ENV_VAR, '')
+    if value and value != '0':
+        enable()
+        if value.endswith(('.json', '.csv')):
+            atexit.register(export, value)
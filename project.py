@@ -1,28 +1,46 @@
-from time import sleep
+from time import perf_counter, sleep
 
+from PyQt5.QtCore import QEvent
 from PyQt5.QtCore import QLocale
 from PyQt5.QtCore import QTimer
 from PyQt5.QtCore import QTimerEvent
 from PyQt5.QtGui import QColor
 from PyQt5.QtGui import QDoubleValidator
+from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QImage
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtGui import QMouseEvent
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtGui import QVector3D
+from PyQt5.QtGui import QPolygonF
+from PyQt5.QtGui import QTransform
 from PyQt5.QtGui import QWheelEvent
 from PyQt5.QtWidgets import QComboBox
 from PyQt5.QtWidgets import QLabel
 from PyQt5.QtWidgets import QLineEdit
+from PyQt5.QtWidgets import QShortcut
 from PyQt5.QtWidgets import QWidget, QApplication
 from PyQt5.QtGui import QPainter, QPen
-from PyQt5.QtCore import Qt, QPoint, QPointF
+from PyQt5.QtCore import Qt, QLineF, QPoint, QPointF, QRect, QRectF
 import numpy as np
+from functools import lru_cache
 from math import cos, pi, sqrt, sin
 import sys
 
+import curves
+import hidden_lines
+import profiling
+import raster
+from animation import AnimationClock
 from geom import Polygon, Solid
+from view import ViewTransform
 
 WIDTH = 1000
 HEIGHT = 800
+ANGULAR_SPEED = {5: 6.0, 6: 0.6}
+ELLIPSE_PIXEL = 10
+MAX_GRID_LINES = 40
+HUD_MARGIN = 6
+ISO_PROJECTION = np.array([[sqrt(3) / 2, -0.5], [0, 1], [-sqrt(3) / 2, -0.5]])
 
 
 def cart2pol(cart_point: QPointF):
@@ -40,14 +58,11 @@ def pol2cart(polar_point: QPointF):
 
 
 def first_func(x, a, b, c):
-    den = ((b + x) * (c - x) ** 2)
-    if den == 0:
-        return 999999
-    return (a * x) / den
+    return (a * x) / ((b + x) * (c - x) ** 2)
 
 
 def second_func(phi, a, b, _):
-    return a + b * cos(phi)
+    return a + b * np.cos(phi)
     # return phi
 
 
@@ -55,6 +70,84 @@ def fifth_func(x, y):
     return x ** 2 - y ** 2
 
 
+def grid_step(span, max_lines=MAX_GRID_LINES):
+    magnitude = 1
+    while True:
+        for factor in (1, 2, 5):
+            if span <= max_lines * factor * magnitude:
+                return factor * magnitude
+        magnitude *= 10
+
+
+@lru_cache(maxsize=32)
+def ellipse_rects(a, b, c, scale, pixel_size):
+    if a <= 0 or b <= 0:
+        return []
+    radius = abs(c) * scale / pixel_size
+    cells = raster.midpoint_ellipse(round(radius / sqrt(a)), round(radius / sqrt(b)))
+    corners = cells * [pixel_size, -pixel_size] - pixel_size // 2
+    return [QRect(x, y, pixel_size, pixel_size) for x, y in corners.tolist()]
+
+
+def to_qpolygon(points):
+    polygon = QPolygonF(len(points))
+    buffer = polygon.data()
+    buffer.setsize(points.size * points.itemsize)
+    np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)[:] = points
+    return polygon
+
+
+def ring_lines(vertices):
+    return to_qpolygon(np.hstack([np.roll(vertices, 1, axis=0), vertices]).reshape(-1, 2))
+
+
+def cosmetic(pen, width=None):
+    pen = QPen(pen)
+    if width is not None:
+        pen.setWidth(width)
+    pen.setCosmetic(True)
+    return pen
+
+
+class PolygonScene:
+    def __init__(self, polygons=()):
+        self.polygons = []
+        self.versions = []
+        self._outlines = {}
+        self._results = {}
+        self._version = 0
+        for polygon in polygons:
+            self.add(polygon)
+
+    def _stamp(self):
+        self._version += 1
+        return self._version
+
+    def add(self, polygon):
+        self.polygons.append(polygon)
+        self.versions.append(self._stamp())
+        return len(self.polygons) - 1
+
+    def edit(self, index, polygon):
+        self.polygons[index] = polygon
+        self.versions[index] = self._stamp()
+        self._outlines.pop(index, None)
+        self._results = {key: value for key, value in self._results.items() if index not in key[1::2]}
+
+    def outline(self, index):
+        cached = self._outlines.get(index)
+        if cached is None or cached[0] != self.versions[index]:
+            cached = self._outlines[index] = self.versions[index], ring_lines(self.polygons[index].vertices)
+        return cached[1]
+
+    def result(self, operation, first, second):
+        key = operation, first, self.versions[first], second, self.versions[second]
+        if key not in self._results:
+            polygons = getattr(self.polygons[first], operation)(self.polygons[second])
+            self._results[key] = [ring_lines(polygon.vertices) for polygon in polygons]
+        return self._results[key]
+
+
 class Example(QWidget):
     def __init__(self):
         super().__init__()
@@ -71,11 +164,14 @@ class Example(QWidget):
         self.angle = 0
         self.tracking = False
         self.last_coords = QPoint(0, 0)
+        self._static_layer = None
+        self._view = None
+        self.clock = AnimationClock(self.advance, parent=self)
         self.initVars()
         self.initUI()
 
     def get_current_task(self):
-        return self.TASKS[self.task_number - 1]
+        return getattr(self, self.TASKS[self.task_number - 1])
 
     def initVars(self):
         self.a = 1
@@ -85,17 +181,37 @@ class Example(QWidget):
         self.k = 1
         self.t_left_top = QPointF(-coef, -coef)
         self.t_right_bottom = QPointF(coef, coef)
-        self.steps_count = 500
+        self.sample_budget = 2000
+        self.samples = curves.SampleCache()
+        self.mesh_rows = 47
+        self.mesh_columns = 199
+        self._mesh = None
         self.alpha = self.t_left_top.x()
         self.beta = self.t_right_bottom.x()
         self.task_number = 1
+        self.polygons = PolygonScene([
+            Polygon([-4, -3, -2, -1, -4, 2, -2, 4, 1, 3, 4, 2, 3, -1, 1, -3]),
+            Polygon([-2, -4, -3, 0, 0, 4, 2, 1, 1, -1, 3, -2]),
+        ])
+        self.cube = Solid(np.array([
+            [2, -2, 0, 0, -1, 1],
+            [0, 0, 2, -2, 0, 0],
+            [1, -1, 0, 0, 2, -2],
+            [6, -4, 2, 1, -2, 6],
+        ]))
+        self.pyramid = Solid(np.array([
+            [2, -2, 0, -1, 1],
+            [0, -4, 2, -2, -2],
+            [1, -1, 0, 2, -2],
+            [1, 1, 1, 5, -3],
+        ]))
         self.TASKS = {
-            0: self.draw_first_func,
-            1: self.draw_second_func,
-            2: self.draw_ellipse,
-            3: self.draw_polygons_residual,
-            4: self.draw_5_task,
-            5: self.draw_6_task,
+            0: 'draw_first_func',
+            1: 'draw_second_func',
+            2: 'draw_ellipse',
+            3: 'draw_polygons_residual',
+            4: 'draw_5_task',
+            5: 'draw_6_task',
         }
 
     def initUI(self):
@@ -146,9 +262,9 @@ class Example(QWidget):
         self.label = QLabel(self)
         pixmap = QPixmap('formula{}.png'.format(self.task_number))
         self.label.setPixmap(pixmap)
-        self.label.move((self.panelWidth - pixmap.width()) / 2, 50)
+        self.label.move((self.panelWidth - pixmap.width()) // 2, 50)
         # self.label.move(0, 100)
-        self.label.setGeometry((self.panelWidth - pixmap.width()) / 2, 50, pixmap.width() + 100, pixmap.height())
+        self.label.setGeometry((self.panelWidth - pixmap.width()) // 2, 50, pixmap.width() + 100, pixmap.height())
 
         label = QLabel(self)
         label.setGeometry(40, 275, 60, 30)
@@ -190,6 +306,7 @@ class Example(QWidget):
         self.right_y_text_field.setValidator(validator)
         self.right_y_text_field.textChanged.connect(self.update_right_y_field)
 
+        QShortcut(QKeySequence(Qt.Key_F3), self, self.toggle_profiling)
         self.setWindowTitle('Points')
         self.show()
 
@@ -197,9 +314,37 @@ class Example(QWidget):
         self.task_number = int(text[-1])
         pixmap = QPixmap('formula{}.png'.format(self.task_number))
         self.label.setPixmap(pixmap)
-        self.label.move((self.panelWidth - pixmap.width()) / 2, 50)
+        self.label.move((self.panelWidth - pixmap.width()) // 2, 50)
+        self.sync_animation()
+        self.update()
+
+    def advance(self, seconds):
+        self.angle += seconds * ANGULAR_SPEED.get(self.task_number, 0)
+        self.update()
+
+    def toggle_profiling(self):
+        profiling.toggle()
         self.update()
 
+    def sync_animation(self):
+        if self.task_number in ANGULAR_SPEED and self.isVisible() and not self.isMinimized():
+            self.clock.start()
+        else:
+            self.clock.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.sync_animation()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.sync_animation()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.sync_animation()
+
     def update_left_x_field(self):
         try:
             self.t_left_top.setX(float(self.left_x_text_field.text()))
@@ -237,14 +382,14 @@ class Example(QWidget):
 
     def update_b_field(self):
         try:
-            self.b = float(self.parameters[0].text())
+            self.b = float(self.parameters[1].text())
             self.update()
         except ValueError:
             pass
 
     def update_c_field(self):
         try:
-            self.c = float(self.parameters[0].text())
+            self.c = float(self.parameters[2].text())
             self.update()
         except ValueError:
             pass
@@ -282,10 +427,10 @@ class Example(QWidget):
     def mouseMoveEvent(self, event: QMouseEvent):
         if not self.tracking:
             return
-        delta = event.pos() - self.last_coords
-        t_delta = QPointF(delta.x() / self.get_x_scale(),
-                          delta.y() / self.get_y_scale())
-        t_delta = QPointF(-t_delta.x(), t_delta.y())
+        world = self.view_transform().inverted().apply([
+            [self.last_coords.x(), self.last_coords.y()], [event.pos().x(), event.pos().y()],
+        ])
+        t_delta = QPointF(*(world[0] - world[1]).tolist())
         self.t_left_top += t_delta
         self.t_right_bottom += t_delta
         self.left_x_text_field.setText(str(round(self.t_left_top.x(), 2)))
@@ -327,198 +472,227 @@ class Example(QWidget):
     def get_y_scale(self):
         return self.real_height() / self.t_height()
 
-    def get_real_coord(self, t_coords):
-        relative_t_coords = t_coords - self.t_left_top
-        relative_real_coords = QPointF(relative_t_coords.x() * self.get_x_scale(),
-                                       self.real_height() - relative_t_coords.y() * self.get_y_scale())
-        return relative_real_coords + self.leftTop()
+    def view_transform(self):
+        left_top, right_bottom = self.leftTop(), self.rightBottom()
+        key = (
+            left_top.x(), left_top.y(), right_bottom.x(), right_bottom.y(),
+            self.t_left_top.x(), self.t_left_top.y(), self.t_right_bottom.x(), self.t_right_bottom.y(),
+        )
+        if self._view is None or self._view[0] != key:
+            self._view = key, ViewTransform.from_windows(key[4:], key[:4])
+        return self._view[1]
 
-    def paintEvent(self, _):
-        try:
-            self.b = float(self.parameters[1].text())
-        except ValueError:
-            pass
-        try:
-            self.c = float(self.parameters[2].text())
-        except ValueError:
-            pass
+    def to_screen(self, x, y):
+        return self.view_transform().apply(np.column_stack([x, y]))
 
+    def paintEvent(self, _):
+        start = perf_counter()
         qp = QPainter()
         qp.begin(self)
-
-        qp.setPen(Qt.black)
-        qp.setBrush(Qt.black)
-        qp.drawRect(self.leftTop().x(), self.leftTop().y(), self.real_width(), self.real_height())
-        self.draw_net(qp)
-
+        self.draw_scene(qp)
+        if profiling.enabled:
+            self.draw_hud(qp)
+        qp.end()
+        elapsed = perf_counter() - start
+        self.clock.record(elapsed)
+        if profiling.enabled:
+            profiling.end_frame(elapsed)
+
+    @profiling.span
+    def draw_scene(self, qp: QPainter):
+        qp.drawPixmap(0, 0, self.static_layer(qp.device().devicePixelRatioF()))
+        qp.save()
+        qp.setClipRect(QRectF(self.leftTop(), self.rightBottom()).adjusted(1 if self.panelWidth else 0, 0, 0, 0))
         qp.setPen(self.func_pen)
+        qp.setBrush(Qt.black)
         self.get_current_task()(qp, self.a, self.b, self.c)
-        qp.setPen(QColor(40, 40, 40))
-        qp.setBrush(QColor(40, 40, 40))
-        qp.drawRect(0, 0, self.panelWidth, self.real_height())
+        qp.restore()
+
+    def draw_hud(self, qp: QPainter):
+        frames, stats = self.clock.stats(), profiling.summary()
+        if not stats['frames']:
+            return
+        lines = ["frame p50 {:.1f} ms, p99 {:.1f} ms".format(frames['p50'], frames['p99'])]
+        lines += ["{:<30} {:7.2f} ms {:7.1f}".format(name, ms, stats['calls'][name])
+                  for name, ms in stats['spans'].items()]
+        lines += ["{:<30} {:>10} {:7.1f}".format(name, '', calls)
+                  for name, calls in sorted(stats['calls'].items()) if name not in stats['spans']]
+        qp.save()
+        font = QFont('monospace', 8)
+        font.setStyleHint(QFont.TypeWriter)
+        qp.setFont(font)
+        metrics = qp.fontMetrics()
+        width = max(metrics.horizontalAdvance(line) for line in lines) + 2 * HUD_MARGIN
+        box = QRectF(self.width() - width - HUD_MARGIN, HUD_MARGIN,
+                     width, metrics.lineSpacing() * len(lines) + 2 * HUD_MARGIN)
+        qp.fillRect(box, QColor(0, 0, 0, 200))
+        qp.setPen(Qt.white)
+        top = box.top() + HUD_MARGIN + metrics.ascent()
+        for i, line in enumerate(lines):
+            qp.drawText(QPointF(box.left() + HUD_MARGIN, top + i * metrics.lineSpacing()), line)
+        qp.restore()
+
+    def static_layer(self, ratio=1.0):
+        key = (
+            self.width(), self.height(), ratio, self.panelWidth, self.padding,
+            self.t_left_top.x(), self.t_left_top.y(), self.t_right_bottom.x(), self.t_right_bottom.y(),
+        )
+        if self._static_layer is None or self._static_layer[0] != key:
+            pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(QColor(40, 40, 40))
+            qp = QPainter(pixmap)
+            plot = QRectF(self.leftTop(), self.rightBottom())
+            qp.setPen(Qt.black)
+            qp.setBrush(Qt.black)
+            qp.drawRect(plot)
+            qp.save()
+            qp.setClipRect(plot)
+            self.draw_net(qp)
+            qp.restore()
+            if self.panelWidth:
+                qp.setPen(QColor(40, 40, 40))
+                qp.setBrush(QColor(40, 40, 40))
+                qp.drawRect(QRectF(0, 0, self.panelWidth, self.real_height()))
+            qp.end()
+            self._static_layer = key, pixmap
+        return self._static_layer[1]
+
+    def render_image(self, width, height):
+        self.resize(width, height)
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(40, 40, 40))
+        qp = QPainter(image)
+        self.draw_scene(qp)
         qp.end()
+        return image
+
+    def world_lines(self, segments):
+        segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+        ends = self.to_screen(segments[:, 0::2].ravel(), segments[:, 1::2].ravel())
+        return [QLineF(x0, y0, x1, y1) for x0, y0, x1, y1 in ends.reshape(-1, 4).tolist()]
 
+    @profiling.span
     def draw_net(self, qp):
+        left, bottom = self.t_left_top.x(), self.t_left_top.y()
+        right, top = self.t_right_bottom.x(), self.t_right_bottom.y()
         qp.setPen(self.axis_pen)
-        p0 = self.get_real_coord(QPointF(self.t_left_top.x(), 0))
-        p1 = self.get_real_coord(QPointF(self.t_right_bottom.x(), 0))
-        p2 = self.get_real_coord(QPointF(0, self.t_left_top.y()))
-        p3 = self.get_real_coord(QPointF(0, self.t_right_bottom.y()))
-        if self.t_left_top.y() < 0:
-            qp.drawLine(p0, p1)
-        if self.t_left_top.x() < 0:
-            qp.drawLine(p2, p3)
+        qp.drawLines(self.world_lines([[left, 0, right, 0], [0, bottom, 0, top]]))
+        step = grid_step(max(self.t_width(), self.t_height()))
+        xs = np.arange(np.ceil(left / step), np.floor(right / step) + 1) * step
+        ys = np.arange(np.ceil(bottom / step), np.floor(top / step) + 1) * step
         qp.setPen(self.coords_pen)
-        for i in range(int(self.t_left_top.x()), int(self.t_right_bottom.x() + 1)):
-            p1 = self.get_real_coord(QPointF(i, self.t_right_bottom.y()))
-            p0 = self.get_real_coord(QPointF(i, self.t_left_top.y()))
-            if p0.x() > self.leftTop().x():
-                qp.drawLine(p0, p1)
-        for i in range(int(self.t_left_top.y()), int(self.t_right_bottom.y() + 1)):
-            p1 = self.get_real_coord(QPointF(self.t_right_bottom.x(), i))
-            p0 = self.get_real_coord(QPointF(self.t_left_top.x(), i))
-            qp.drawLine(p0, p1)
-
+        qp.drawLines(self.world_lines(np.concatenate([
+            np.column_stack([xs, np.full_like(xs, bottom), xs, np.full_like(xs, top)]),
+            np.column_stack([np.full_like(ys, left), ys, np.full_like(ys, right), ys]),
+        ])))
+
+    def screen_bounds(self):
+        left_top, right_bottom = self.leftTop(), self.rightBottom()
+        return left_top.x(), left_top.y(), right_bottom.x(), right_bottom.y()
+
+    def world_window(self, margin=0):
+        width, height = self.t_width(), self.t_height()
+        return (
+            self.t_left_top.x() - margin * width, self.t_left_top.y() - margin * height,
+            self.t_right_bottom.x() + margin * width, self.t_right_bottom.y() + margin * height,
+        )
+
+    def sample_curve(self, world, start, stop):
+        window = self.world_window(1)
+        corners = self.to_screen(np.array(window[::2]), np.array(window[1::2]))
+        t, _, joined = curves.adaptive_sample(
+            lambda t: self.to_screen(*curves.evaluate(world, t).T), start, stop, self.sample_budget,
+            bounds=(*corners.min(axis=0), *corners.max(axis=0)),
+        )
+        return window, t, curves.evaluate(world, t), joined
+
+    @profiling.span
+    def draw_curve(self, qp, params, world, start, stop, padding=0):
+        start, stop = sorted((start, stop))
+        key = (self.task_number, *params, self.alpha, self.beta, self.sample_budget)
+        _, points, joined = self.samples.get(
+            key, (start, stop), self.world_window(), self.view_transform().scale,
+            lambda: self.sample_curve(world, start - padding, stop + padding),
+        )
+        bounds = self.screen_bounds()
+        margin = self.real_width() + self.real_height()
+        points = np.clip(self.to_screen(*points.T), np.subtract(bounds[:2], margin), np.add(bounds[2:], margin))
+        for run in curves.split_runs(points, joined):
+            qp.drawPolyline(to_qpolygon(run))
+
+    @profiling.span
     def draw_first_func(self, qp, *params):
-        # step_size = (self.t_right_bottom.x() - self.t_left_top.x()) / (self.steps_count - 1)
-        step_size = (self.beta - self.alpha) / (self.steps_count - 1)
-        t_x_0 = self.t_left_top.x()
-        t_y_0 = first_func(t_x_0, *params)
-        start_point = QPointF(t_x_0, t_y_0)
-        prev_point = self.get_real_coord(start_point)
-        for i in range(1, self.steps_count):
-            t_x = i * step_size + self.t_left_top.x()
-            t_y = first_func(t_x, *params)
-            c_point = QPointF(t_x, t_y)
-            current_point = self.get_real_coord(c_point)
-            if abs(current_point.y() - prev_point.y()) < self.real_height() * 2:
-                qp.drawLine(prev_point, current_point)
-            prev_point = current_point
+        start = self.t_left_top.x()
+        self.draw_curve(
+            qp, params, lambda x: np.column_stack([x, first_func(x, *params)]),
+            start, start + self.beta - self.alpha, padding=self.t_width(),
+        )
 
+    @profiling.span
     def draw_second_func(self, qp, *params):
-        prev_point = pol2cart(QPointF(second_func(0, *params), 0))
-        step_size = (self.beta - self.alpha) / (self.steps_count - 1)
-        for i in range(1, self.steps_count):
-            phi = i * step_size
-            r = second_func(phi, *params)
-            new_point = pol2cart(QPointF(r, phi))
-            qp.drawLine(
-                self.get_real_coord(prev_point),
-                self.get_real_coord(new_point),
-            )
-            prev_point = new_point
-
-    def draw_ellipse(self, qp: QPainter, *params):
-        a = self.a
-        b = self.b
+        self.draw_curve(
+            qp, params, lambda phi: np.column_stack(curves.polar_to_cartesian(phi, second_func(phi, *params))),
+            0, self.beta - self.alpha,
+        )
+
+    @profiling.span
+    def draw_ellipse(self, qp: QPainter, a, b, c):
         x0 = int(self.leftTop().x() + (self.width() - self.leftTop().x()) // 2)
         y0 = self.height() // 2
-        r = self.c * self.get_x_scale()
-        x = x0 - r
-        y = y0
-        counter = 0
-        pixel_size = 10
-        while x < x0:
-            qp.drawRect(x - pixel_size // 2, y - pixel_size // 2, pixel_size, pixel_size)
-            qp.drawRect(2 * x0 - x - pixel_size // 2, 2 * y0 - y - pixel_size // 2, pixel_size, pixel_size)
-            qp.drawRect(x - pixel_size // 2, 2 * y0 - y - pixel_size // 2, pixel_size, pixel_size)
-            qp.drawRect(2 * x0 - x - pixel_size // 2, y - pixel_size // 2, pixel_size, pixel_size)
-            xs = [0, 1]
-            ys = [0, -1]
-            min_point = 0, 0
-            min_len = 9999999
-            for dx in xs:
-                for dy in ys:
-                    if not dx and not dy:
-                        continue
-                    new_x = x + dx * pixel_size
-                    new_y = y + dy * pixel_size
-                    ln = abs((new_x - x0) ** 2 * a + (new_y - y0) ** 2 * b - r ** 2)
-                    if ln < min_len:
-                        min_len = ln
-                        min_point = new_x, new_y
-            x, y = min_point
-            x, y = int(x), int(y)
-            qp.drawRect(x - pixel_size // 2, y - pixel_size // 2, pixel_size, pixel_size)
-            qp.drawRect(2 * x0 - x - pixel_size // 2, 2 * y0 - y - pixel_size // 2, pixel_size, pixel_size)
-            qp.drawRect(x - pixel_size // 2, 2 * y0 - y - pixel_size // 2, pixel_size, pixel_size)
-            qp.drawRect(2 * x0 - x - pixel_size // 2, y - pixel_size // 2, pixel_size, pixel_size)
-            counter += 1
-
-    def draw_polygon(self, qp: QPainter, polygon: Polygon):
-        for i in range(-1, len(polygon.pure_points) - 1):
-            qp.drawLine(
-                self.get_real_coord(QPointF(*polygon.pure_points[i].coords)),
-                self.get_real_coord(QPointF(*polygon.pure_points[i + 1].coords))
-            )
+        qp.save()
+        qp.translate(x0, y0)
+        qp.drawRects(ellipse_rects(a, b, c, self.get_x_scale(), ELLIPSE_PIXEL))
+        qp.restore()
 
+    def world_qtransform(self):
+        m = self.view_transform().matrix
+        return QTransform(m[0, 0], m[1, 0], m[0, 1], m[1, 1], m[0, 2], m[1, 2])
+
+    @profiling.span
     def draw_polygons_residual(self, qp: QPainter, *params):
-        p1 = Polygon([-4, -3, -2, -1, -4, 2, -2, 4, 1, 3, 4, 2, 3, -1, 1, -3])
-        p2 = Polygon([-2, -4, -3, 0, 0, 4, 2, 1, 1, -1, 3, -2])
+        scene = self.polygons
+        qp.save()
+        qp.setTransform(self.world_qtransform(), True)
+        qp.setPen(cosmetic(qp.pen()))
         if self.a == 1:
-            self.draw_polygon(qp, p1)
+            qp.drawLines(scene.outline(0))
 
         if self.b == 1:
-            blue_pen = QPen(Qt.blue)
-            blue_pen.setWidth(3)
-            qp.setPen(blue_pen)
-            self.draw_polygon(qp, p2)
+            qp.setPen(cosmetic(QPen(Qt.blue), 3))
+            qp.drawLines(scene.outline(1))
 
         if self.c != 1:
-            yellow_pen = QPen(Qt.yellow)
-            yellow_pen.setWidth(3)
-            qp.setPen(yellow_pen)
-            for p in p1 - p2:
-                self.draw_polygon(qp, p)
-
-    def get_coords_from_3d(self, point: QVector3D, k):
-        return QPointF(point.x() - k * point.z() / 2, point.y() - k * point.z() / 2)
-
-    def draw_line_in_3d(self, qp, p1: QVector3D, p2: QVector3D, k):
-        p1_in_2d = self.get_real_coord(self.get_coords_from_3d(p1, k))
-        p2_in_2d = self.get_real_coord(self.get_coords_from_3d(p2, k))
-        qp.drawLine(p1_in_2d, p2_in_2d)
-
+            qp.setPen(cosmetic(QPen(Qt.yellow), 3))
+            for outline in scene.result('difference', 0, 1):
+                qp.drawLines(outline)
+        qp.restore()
+
+    def surface_mesh(self):
+        key = self.mesh_rows, self.mesh_columns
+        if self._mesh is None or self._mesh[0] != key:
+            x, y = np.meshgrid(np.linspace(-9.9, 9.9, self.mesh_columns), np.linspace(-3.2, 1.4, self.mesh_rows))
+            self._mesh = key, np.stack([x, fifth_func(x, y), y], axis=-1)
+        return self._mesh[1]
+
+    @profiling.span
     def draw_5_task(self, qp: QPainter, *params):
         qp.setPen(self.slim_pen)
-        self.angle += 0.1
         k = pi * sin(self.angle) / 2
-        for y in range(-32, 15):
-            y /= 10
-            left = -100
-            right = 100
-            start_z = fifth_func(left, y)
-            prev_point = QVector3D(left, y, start_z)
-            for x in range(left + 1, right):
-                x /= 10
-                z = fifth_func(x, y)
-                new_point = QVector3D(x, z, y)
-                self.draw_line_in_3d(qp, prev_point, new_point, k)
-                prev_point = new_point
-        self.update()
-
-    @staticmethod
-    def get_qt_vector_from_hgen_coords(point):
-        return QVector3D(*point.coords)
+        screen = self.view_transform().apply(self.surface_mesh(), [[1, 0], [0, 1], [-k / 2, -k / 2]])
+        for row in screen:
+            qp.drawPolyline(to_qpolygon(row))
 
+    @profiling.span
     def draw_solid(self, qp: QPainter, solid, view_point=None):
-        edges = solid.edges.values() if view_point is None else solid.get_visible_edges(view_point)
-        for edge in edges:
-            # print(self.get_qt_vector_from_hgen_coords(edge[0]))
-            # print(self.get_qt_vector_from_hgen_coords(edge[1]))
-            qp.drawLine(
-                self.get_real_2d_coords_from_theoretical_3d_coords(QVector3D(self.get_qt_vector_from_hgen_coords(edge[0]))),
-                self.get_real_2d_coords_from_theoretical_3d_coords(QVector3D(self.get_qt_vector_from_hgen_coords(edge[1])))
-            )
-        # print("end\n\n\n")
-
-    def get_real_2d_coords_from_theoretical_3d_coords(self, point: QVector3D):
-        z = point.x()
-        y = point.y()
-        x = point.z()
-        x_2 = -(x - z) * sqrt(3) / 2
-        y_2 = -((x + z) / 2 - y)
-        return self.get_real_coord(QPointF(x_2, y_2))
+        edges = solid.edge_vertices if view_point is None else solid.edge_vertices[solid.visible_edge_mask(view_point)]
+        ends = self.view_transform().apply(solid.vertices[edges], ISO_PROJECTION)
+        qp.drawLines(to_qpolygon(ends.reshape(-1, 2)))
+
+    @profiling.span
+    def draw_solids(self, qp: QPainter, solids, view_point):
+        segments = hidden_lines.visible_segments(solids, view_point, ISO_PROJECTION)
+        qp.drawLines(to_qpolygon(self.view_transform().apply(segments).reshape(-1, 2)))
 
     @staticmethod
     def gen_rot_matrix(alpha):
@@ -529,40 +703,18 @@ class Example(QWidget):
             [0, 0, 0, 1]
         ])
 
-    def rotate_solid(self, solid_matrix, alpha):
-        return self.gen_rot_matrix(alpha).dot(solid_matrix)
-
+    @profiling.span
     def draw_6_task(self, qp: QPainter, *params):
         qp.setPen(self.func_pen)
         view_point = np.array([1, 1, 1, 0])
-
-        # cube
-        cube_matrix = np.array([
-            [2, -2, 0, 0, -1, 1],
-            [0, 0, 2, -2, 0, 0],
-            [1, -1, 0, 0, 2, -2],
-            [6, -4, 2, 1, -2, 6],
-        ])
-        cube_matrix = self.rotate_solid(cube_matrix, self.angle)
-        cube = Solid(cube_matrix)
-        self.draw_solid(qp, cube, view_point)
-
-        # pyramid
-        pyramid_matrix = np.array([
-            [2, -2, 0, -1, 1],
-            [0, -4, 2, -2, -2],
-            [1, -1, 0, 2, -2],
-            [1, 1, 1, 5, -3],
-        ])
-        self.angle += 0.01
-        pyramid_matrix = self.rotate_solid(pyramid_matrix, self.angle)
-        pyramid = Solid(pyramid_matrix)
-        self.draw_solid(qp, pyramid, view_point)
-        self.update()
+        cube = self.cube.transformed(self.gen_rot_matrix(self.angle))
+        pyramid = self.pyramid.transformed(self.gen_rot_matrix(self.angle + 0.01))
+        self.draw_solids(qp, [cube, pyramid], view_point)
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    profiling.from_env()
     ex = Example()
     sys.exit(app.exec_())
 
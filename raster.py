@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def _first_quadrant(rx, ry):
+    rx2, ry2 = rx * rx, ry * ry
+    x, y = 0, ry
+    dx, dy = 0, 2 * rx2 * y
+    points = []
+    decision = 4 * ry2 - 4 * rx2 * ry + rx2
+    while dx < dy:
+        points.append((x, y))
+        x += 1
+        dx += 2 * ry2
+        if decision >= 0:
+            y -= 1
+            dy -= 2 * rx2
+            decision -= 4 * dy
+        decision += 4 * (dx + ry2)
+    decision = ry2 * (2 * x + 1) ** 2 + 4 * rx2 * (y - 1) ** 2 - 4 * rx2 * ry2
+    while y >= 0:
+        points.append((x, y))
+        y -= 1
+        dy -= 2 * rx2
+        if decision <= 0:
+            x += 1
+            dx += 2 * ry2
+            decision += 4 * dx
+        decision += 4 * (rx2 - dy)
+    points.extend((x, 0) for x in range(points[-1][0] + 1, rx + 1))
+    return points
+
+
+def midpoint_ellipse(rx, ry):
+    rx, ry = int(rx), int(ry)
+    if rx < 0 or ry < 0:
+        raise ValueError('negative semi-axis')
+    if not rx or not ry:
+        steps = np.arange(-max(rx, ry), max(rx, ry) + 1)
+        points = np.column_stack([steps, np.zeros_like(steps)])
+        return points if rx else points[:, ::-1].copy()
+    quadrant = np.array(_first_quadrant(rx, ry))
+    points = np.concatenate([quadrant * sign for sign in ((1, 1), (-1, 1), (1, -1), (-1, -1))])
+    return np.unique(points, axis=0)
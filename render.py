@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+
+VIEW = {
+    'left': ('t_left_top', 'x'),
+    'bottom': ('t_left_top', 'y'),
+    'right': ('t_right_bottom', 'x'),
+    'top': ('t_right_bottom', 'y'),
+}
+FIELDS = ('a', 'b', 'c', 'alpha', 'beta', 'angle') + tuple(VIEW)
+_worker = None
+
+
+def parse_sweep(text):
+    name, _, values = text.partition('=')
+    if name not in FIELDS:
+        raise argparse.ArgumentTypeError('unknown parameter {!r}, expected one of {}'.format(name, ', '.join(FIELDS)))
+    try:
+        if ':' in values:
+            start, stop, count = values.split(':')
+            return name, np.linspace(float(start), float(stop), int(count)).tolist()
+        return name, [float(value) for value in values.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('bad values for {!r}: {!r}'.format(name, values))
+
+
+def parse_size(text):
+    try:
+        width, height = map(int, text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected WIDTHxHEIGHT, got {!r}'.format(text))
+    return width, height
+
+
+def make_jobs(task, sweeps, output):
+    names = [name for name, _ in sweeps]
+    for i, values in enumerate(product(*(values for _, values in sweeps))):
+        yield os.path.join(output, 'task{}_{:06d}.png'.format(task, i)), task, dict(zip(names, values))
+
+
+def get_field(example, name):
+    if name in VIEW:
+        point, axis = VIEW[name]
+        return getattr(getattr(example, point), axis)()
+    return getattr(example, name)
+
+
+def set_field(example, name, value):
+    if name in VIEW:
+        point, axis = VIEW[name]
+        getattr(getattr(example, point), 'set' + axis.upper())(value)
+    else:
+        setattr(example, name, value)
+
+
+def _init_worker(size, panel):
+    global _worker
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from project import Example
+    app = QApplication.instance() or QApplication([])
+    example = Example()
+    if not panel:
+        example.panelWidth = 0
+    defaults = {name: get_field(example, name) for name in FIELDS}
+    _worker = app, example, defaults, size
+
+
+def render_job(job):
+    path, task, values = job
+    _, example, defaults, size = _worker
+    example.task_number = task
+    for name, value in dict(defaults, **values).items():
+        set_field(example, name, value)
+    if not example.render_image(*size).save(path):
+        raise OSError('cannot write {}'.format(path))
+    return path
+
+
+def render_many(jobs, size=(800, 600), panel=False, workers=None, chunk_size=32):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(size, panel)
+        yield from map(render_job, jobs)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(size, panel)) as executor:
+        yield from executor.map(render_job, jobs, chunksize=chunk_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render tasks to PNG files without a display.')
+    parser.add_argument('--task', type=int, choices=range(1, 7), default=1)
+    parser.add_argument('--size', type=parse_size, default=(800, 600), help='WIDTHxHEIGHT')
+    parser.add_argument('--param', type=parse_sweep, action='append', default=[],
+                        help='NAME=START:STOP:COUNT or NAME=V1,V2,...; several sweeps form a grid')
+    parser.add_argument('--panel', action='store_true', help='keep the control panel strip')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=32)
+    parser.add_argument('-o', '--output', default='frames')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    jobs = list(make_jobs(args.task, args.param, args.output))
+    start = perf_counter()
+    for _ in render_many(jobs, args.size, args.panel, args.workers, args.chunk_size):
+        pass
+    elapsed = perf_counter() - start
+    print('{} frames in {:.2f}s ({:.0f} frames/min)'.format(len(jobs), elapsed, len(jobs) / elapsed * 60))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
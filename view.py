@@ -0,0 +1,36 @@
+import numpy as np
+
+import profiling
+
+
+class ViewTransform:
+    def __init__(self, matrix):
+        self.matrix = np.asarray(matrix, dtype=float)
+
+    @classmethod
+    def from_windows(cls, world, screen):
+        x_scale = (screen[2] - screen[0]) / (world[2] - world[0])
+        y_scale = (screen[3] - screen[1]) / (world[3] - world[1])
+        return cls([
+            [x_scale, 0, screen[0] - x_scale * world[0]],
+            [0, -y_scale, screen[3] + y_scale * world[1]],
+            [0, 0, 1],
+        ])
+
+    @property
+    def scale(self):
+        return abs(self.matrix[0, 0]), abs(self.matrix[1, 1])
+
+    def inverted(self):
+        return ViewTransform(np.linalg.inv(self.matrix))
+
+    @profiling.counted
+    def apply(self, points, linear=None):
+        points = np.asarray(points, dtype=float)
+        shape = points.shape
+        matrix = self.matrix[:2, :2].T if linear is None else np.dot(linear, self.matrix[:2, :2].T)
+        screen = points.reshape(-1, shape[-1]).dot(matrix)
+        screen += self.matrix[:2, 2]
+        return screen.reshape(shape[:-1] + (2,))
+
+    __call__ = apply